@@ -1,7 +1,6 @@
 # app/__init__.py
 from flask import Flask, g, request, jsonify
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
 from pymongo import MongoClient, errors
 import time
 
@@ -11,11 +10,16 @@ from app.routes.schedule_routes import schedule_routes
 from app.routes.auth_routes import auth_routes
 from app.routes.token_routes import token_routes
 from app.routes.other_routes import other_routes
+from app.utils.json_provider import ORJSONProvider
+from app.utils.jwt_cache import CachingJWTManager
 
 
 def create_app():
     app = Flask(__name__)
 
+    # Serialize and parse JSON with orjson (jsonify, request.get_json, ...)
+    app.json = ORJSONProvider(app)
+
     # Apply configuration
     app.config.from_object(config)
     config.init_app(app)
@@ -31,6 +35,10 @@ def create_app():
     else:
         CORS(app)
 
+    # Match "/x" and "/x/" alike instead of answering with a redirect; must be set
+    # before the blueprints are registered, since rules read it when they are bound
+    app.url_map.strict_slashes = False
+
     # Register blueprints
     app.register_blueprint(auth_routes, url_prefix="/auth")
     app.register_blueprint(schedule_routes, url_prefix="/schedule")
@@ -38,8 +46,8 @@ def create_app():
     app.register_blueprint(chat_routes, url_prefix="/chat")
     app.register_blueprint(token_routes, url_prefix="/token")
 
-    # Initialize JWT
-    jwt = JWTManager(app)
+    # Initialize JWT, reusing recently verified tokens
+    jwt = CachingJWTManager(app)
 
     # Request timing
     @app.before_request
@@ -85,4 +93,23 @@ def create_app():
             methods = ', '.join(rule.methods)
             print(f"{rule.endpoint:30s} {methods:20s} {rule.rule}")
 
+    # Command to pick the Argon2 time cost for this machine
+    @app.cli.command("calibrate-argon2")
+    def calibrate_argon2_command():
+        """Measure the Argon2 time cost that meets ARGON2_TARGET_MS."""
+        from app.utils.passwords import calibrate_time_cost
+
+        time_cost = calibrate_time_cost(config.ARGON2_TARGET_MS)
+        print(f"Set ARGON2_TIME_COST={time_cost} on every worker")
+
+    # Command to create any missing MongoDB indexes
+    @app.cli.command("ensure-indexes")
+    def ensure_indexes_command():
+        """Create missing indexes for all model collections."""
+        from db import ensure_indexes
+        from app.models import voice_settings_model  # Not imported by any view
+
+        for name in ensure_indexes():
+            print(f"Indexes ensured for '{name}'")
+
     return app
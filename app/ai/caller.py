@@ -1,7 +1,9 @@
-from openai import OpenAI
 from dotenv import load_dotenv
+from threading import Lock
+import logging
+import re
 import tiktoken
-import json
+import orjson
 from app.utils.helper import extract_json_from_text, parse_datetime, extract_speak_block
 from config import config
 from typing import Optional, Dict, Any, List
@@ -10,13 +12,166 @@ import datetime
 
 load_dotenv()
 
-# Initialize OpenAI client
-openai_client = OpenAI()
+logger = logging.getLogger(__name__)
+
+# OpenAI client, created on first use so importing this module stays cheap
+_openai_client = None
+_openai_client_lock = Lock()
 
 openai_model = config.OPENAI_MODEL
 
 enc = tiktoken.encoding_for_model(openai_model)
 
+# Instructions for the schedule-intent parser. Kept byte-identical across calls, and
+# sent ahead of anything that changes, so OpenAI can serve it from its prompt cache
+_SCHEDULE_INTENT_SYSTEM_PROMPT = (
+    "You are a strict schedule-intent parser. You do NOT chat. You do NOT explain. "
+    "You ONLY read the entire conversation below to see if the user wants to create, update, or delete schedules. "
+    "\n\n"
+    "Output EXACTLY one of the following:\n\n"
+    "1) A JSON array of one or more objects (like `[ {...}, {...} ]`). "
+    "   Each object in the array must be one of the following:\n"
+    "   JSON for creating a schedule"
+    "   {\n"
+    '     "intent": "add_schedule",\n'
+    '     "schedule_title": "Event Title",\n'
+    '     "start_time": "YYYY-MM-DD HH:MM:SS",\n'
+    '     "end_time": "YYYY-MM-DD HH:MM:SS"\n'
+    '     "image": "image name" // optional, This is an image name describing what would be used to display\n'
+    "   },\n"
+    "   JSON for updating a schedule"
+    "   {\n"
+    '     "intent": "update_schedule",\n'
+    '     "schedule_identifier": "existing schedule name",\n'
+    '     "existing_start_time": "YYYY-MM-DD HH:MM:SS",\n'
+    '     "new_title": "Updated Title" // optional,\n'
+    '     "new_start_time": "YYYY-MM-DD HH:MM:SS" // optional,\n'
+    '     "new_end_time": "YYYY-MM-DD HH:MM:SS" // optional\n'
+    "   },\n"
+    "   JSON for deleting a schedule"
+    "   {\n"
+    '     "intent": "delete_schedule",\n'
+    '     "schedule_identifier": "existing schedule name",\n'
+    '     "existing_start_time": "YYYY-MM-DD HH:MM:SS"\n'
+    "   }\n\n"
+    "2) The word 'null' (as a string) if no schedule creation, update, or delete is recognized.\n\n"
+    "IMPORTANT:\n"
+    "- You MUST NOT produce any text besides the JSON array or 'null'.\n"
+    "- If there's no schedule-intent, or data is incomplete, output 'null' ONLY.\n"
+    "- You do NOT wrap JSON in code fences. You do NOT add extra commentary.\n"
+    "- Either a valid JSON array of objects or 'null'.\n"
+    "- Even if there's only a single action, it must still be in an array like `[ {...} ]`.\n\n"
+    "- The most recent information the user provides is what would be used.\n"
+    "- For image name, you must only pick from the following: 'woman_taking_dog_on_walk', 'man_cooking', 'woman_cleaning', 'man_reading', 'woman_exercising'\n"
+    "- Pick the image that best describes the schedule. If there isn't a good describing image for the current schedule, don't provide the image field.\n"
+    "- You would assess the entire conversation to find out what the user wants to do and you would do it well."
+    "- You will only return the json when the other AI asks for confirmation and the user accepts the confirmation."
+)
+
+# Groups parser requests for OpenAI prompt cache routing
+_SCHEDULE_INTENT_PROMPT_CACHE_KEY = "schedule_intent_v1"
+
+# Static parts of the action-result prompts built by generate_action_response; only
+# the action details between the head and tail change from call to call
+_CALL_ACTION_PROMPT_HEAD = (
+    "You must produce your entire response in valid SSML inside a single <speak>...</speak> block. "
+    "Use friendly, casual language. Possibly use <prosody> or <break> for variety. "
+    "No disclaimers or code blocks. Just SSML.\n\n"
+)
+_CALL_ACTION_PROMPT_TAIL = (
+    "Generate a short summary of what happened with this schedule action. "
+    "If success, you can say something upbeat; if fail, politely mention the issue. "
+    "But always respond in SSML.\n"
+    "You can use the following SSML features for realism:\n"
+    "   - <prosody> for pitch/rate changes\n"
+    "   - <break> to insert natural pauses\n"
+    "   - <emphasis> to highlight key words\n"
+    "   - volume/pitch variations for emotional effect\n"
+)
+_CHAT_ACTION_PROMPT_HEAD = (
+    "You are Remindria, a friendly scheduling assistant. "
+    "You have just performed an action on a schedule (create, update, or delete). "
+    "Please produce a short, user-facing message in plain text. "
+    "No disclaimers or code blocks.\n\n"
+)
+_CHAT_ACTION_PROMPT_TAIL = (
+    "Generate a short summary of what happened with this schedule action. "
+    "If success, you can say something upbeat; if fail, mention the problem.\n"
+)
+
+# Words and times that show up whenever schedules are being discussed. Turns without
+# any of them cannot lead to a schedule action, so the parser skips the model call
+_SCHEDULE_INTENT_RE = re.compile(
+    r"\b(schedul\w*|remind\w*|meeting|appointment|event|calendar|tomorrow|today|"
+    r"tonight|next\s+\w+|monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"delete|cancel|move|update|change|\d{1,2}(:\d{2})?\s*(am|pm)|\d{1,2}:\d{2})\b",
+    re.IGNORECASE,
+)
+
+# Recent non-system messages checked by the prefilter. The assistant's confirmation
+# question is included, as the user's reply to it is often just "yes"
+_SCHEDULE_INTENT_WINDOW = 4
+
+
+def _get_openai_client():
+    """
+    Returns the shared OpenAI client, creating it on first use.
+
+    Returns:
+        openai.OpenAI: The OpenAI client.
+    """
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                import httpx
+                from openai import OpenAI
+
+                # HTTP/2 multiplexes concurrent requests over kept-alive connections,
+                # so bursts of calls do not each pay a TCP/TLS handshake
+                http_client = httpx.Client(
+                    http2=True,
+                    timeout=httpx.Timeout(30.0, connect=5.0),
+                    limits=httpx.Limits(
+                        max_keepalive_connections=32, max_connections=64
+                    ),
+                )
+                _openai_client = OpenAI(http_client=http_client)
+    return _openai_client
+
+
+def _read_until_complete_json(stream):
+    """
+    Reads a streamed completion until it holds a complete JSON array or object, or
+    the word "null", then closes the stream instead of waiting for the rest.
+
+    Args:
+        stream (openai.Stream): The streamed chat completion.
+
+    Returns:
+        str: The text received, stripped of surrounding whitespace.
+    """
+    parts = []
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            parts.append(delta)
+
+            # Only a closing bracket or the end of "null" can complete the answer
+            if "]" in delta or "}" in delta or "l" in delta:
+                text = "".join(parts)
+                if text.strip().strip("'\"").lower() == "null":
+                    break
+                if extract_json_from_text(text):
+                    break
+    finally:
+        stream.close()
+    return "".join(parts).strip()
+
 
 def generate_chat_title(
     user_info, schedules_readable, not_seen_others_readable, seen_others_readable
@@ -96,7 +251,7 @@ def get_ai_response(prompt, conversation_history, model="gpt-4o-mini"):
     # conversation_history.append({"role": "user", "content": prompt})
 
     # Call the OpenAI API
-    response = openai_client.chat.completions.create(
+    response = _get_openai_client().chat.completions.create(
         model=model,
         messages=conversation_history,
     )
@@ -146,29 +301,12 @@ def generate_action_response(
     if conversation_type == "call":
         # For phone-call style => produce SSML
         system_prompt = (
-            "You must produce your entire response in valid SSML inside a single <speak>...</speak> block. "
-            "Use friendly, casual language. Possibly use <prosody> or <break> for variety. "
-            "No disclaimers or code blocks. Just SSML.\n\n"
-            + base_instructions
-            + "Generate a short summary of what happened with this schedule action. "
-            "If success, you can say something upbeat; if fail, politely mention the issue. "
-            "But always respond in SSML.\n"
-            "You can use the following SSML features for realism:\n"
-            "   - <prosody> for pitch/rate changes\n"
-            "   - <break> to insert natural pauses\n"
-            "   - <emphasis> to highlight key words\n"
-            "   - volume/pitch variations for emotional effect\n"
+            _CALL_ACTION_PROMPT_HEAD + base_instructions + _CALL_ACTION_PROMPT_TAIL
         )
     else:
         # Normal chat => plain text
         system_prompt = (
-            "You are Remindria, a friendly scheduling assistant. "
-            "You have just performed an action on a schedule (create, update, or delete). "
-            "Please produce a short, user-facing message in plain text. "
-            "No disclaimers or code blocks.\n\n"
-            + base_instructions
-            + "Generate a short summary of what happened with this schedule action. "
-            "If success, you can say something upbeat; if fail, mention the problem.\n"
+            _CHAT_ACTION_PROMPT_HEAD + base_instructions + _CHAT_ACTION_PROMPT_TAIL
         )
 
     messages = [
@@ -177,7 +315,7 @@ def generate_action_response(
         # for msg in conversation_history: messages.append(msg)
     ]
 
-    response = openai_client.chat.completions.create(
+    response = _get_openai_client().chat.completions.create(
         model=model,
         messages=messages,
         temperature=0,
@@ -267,74 +405,45 @@ def parse_natural_language_instructions(
     - If no recognized schedule operations, returns None.
     """
 
-    # 1. Build a strong system prompt that instructs the LLM to always output a JSON array
-    #    of objects (except "null" if no schedule action is recognized).
-    system_prompt = (
-        "You are a strict schedule-intent parser. You do NOT chat. You do NOT explain. "
-        "You ONLY read the entire conversation below to see if the user wants to create, update, or delete schedules. "
-        "\n\n"
-        "Output EXACTLY one of the following:\n\n"
-        "1) A JSON array of one or more objects (like `[ {...}, {...} ]`). "
-        "   Each object in the array must be one of the following:\n"
-        "   JSON for creating a schedule"
-        "   {\n"
-        '     "intent": "add_schedule",\n'
-        '     "schedule_title": "Event Title",\n'
-        '     "start_time": "YYYY-MM-DD HH:MM:SS",\n'
-        '     "end_time": "YYYY-MM-DD HH:MM:SS"\n'
-        '     "image": "image name" // optional, This is an image name describing what would be used to display\n'
-        "   },\n"
-        "   JSON for updating a schedule"
-        "   {\n"
-        '     "intent": "update_schedule",\n'
-        '     "schedule_identifier": "existing schedule name",\n'
-        '     "existing_start_time": "YYYY-MM-DD HH:MM:SS",\n'
-        '     "new_title": "Updated Title" // optional,\n'
-        '     "new_start_time": "YYYY-MM-DD HH:MM:SS" // optional,\n'
-        '     "new_end_time": "YYYY-MM-DD HH:MM:SS" // optional\n'
-        "   },\n"
-        "   JSON for deleting a schedule"
-        "   {\n"
-        '     "intent": "delete_schedule",\n'
-        '     "schedule_identifier": "existing schedule name",\n'
-        '     "existing_start_time": "YYYY-MM-DD HH:MM:SS"\n'
-        "   }\n\n"
-        "2) The word 'null' (as a string) if no schedule creation, update, or delete is recognized.\n\n"
-        "IMPORTANT:\n"
-        "- You MUST NOT produce any text besides the JSON array or 'null'.\n"
-        "- If there's no schedule-intent, or data is incomplete, output 'null' ONLY.\n"
-        "- You do NOT wrap JSON in code fences. You do NOT add extra commentary.\n"
-        "- Either a valid JSON array of objects or 'null'.\n"
-        "- Even if there's only a single action, it must still be in an array like `[ {...} ]`.\n\n"
-        "- The most recent information the user provides is what would be used.\n"
-        "- For image name, you must only pick from the following: 'woman_taking_dog_on_walk', 'man_cooking', 'woman_cleaning', 'man_reading', 'woman_exercising'\n"
-        "- Pick the image that best describes the schedule. If there isn't a good describing image for the current schedule, don't provide the image field.\n"
-        "- You would assess the entire conversation to find out what the user wants to do and you would do it well."
-        "- You will only return the json when the other AI asks for confirmation and the user accepts the confirmation."
-        f"- The date and time right now is {datetime.datetime.now().strftime("%Y-%m-%d-%H-%M")} \n"
+    # 0. Skip the model call when the recent turns cannot contain a schedule action
+    recent_messages = [
+        msg["content"] for msg in conversation_history if msg["role"] != "system"
+    ][-_SCHEDULE_INTENT_WINDOW:]
+    if not any(_SCHEDULE_INTENT_RE.search(content) for content in recent_messages):
+        return None
+
+    # 1. The static instructions (a JSON array of actions, or "null") come first; the
+    #    current time and schedules follow in their own system message
+    context_prompt = (
+        f"- The date and time right now is {datetime.datetime.now().strftime('%Y-%m-%d-%H-%M')} \n"
         f"Schedules we are working with are: {schedules}"
     )
 
     # 2. Build the message sequence for the chat model
-    messages = [{"role": "system", "content": system_prompt}]
+    messages = [
+        {"role": "system", "content": _SCHEDULE_INTENT_SYSTEM_PROMPT},
+        {"role": "system", "content": context_prompt},
+    ]
     for msg in conversation_history:
         if msg["role"] != "system":
             messages.append({"role": msg["role"], "content": msg["content"]})
 
     # 3. Call the LLM
     try:
-        response = openai_client.chat.completions.create(
+        # Stream the answer so it can be cut off as soon as it is complete
+        stream = _get_openai_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
             temperature=0,
             max_tokens=400,
+            stream=True,
+            extra_body={"prompt_cache_key": _SCHEDULE_INTENT_PROMPT_CACHE_KEY},
         )
-    except Exception as e:
-        print(f"OpenAI error: {e}")
+        ai_text = _read_until_complete_json(stream)
+    except Exception:
+        logger.exception("OpenAI error while parsing schedule intent")
         return None
-
-    ai_text = response.choices[0].message.content.strip()
-    print("\nRaw AI Response:\n", ai_text)
+    logger.debug("Raw AI response: %s", ai_text)
 
     # 4. Extract JSON from the AI response
     json_str = extract_json_from_text(ai_text)
@@ -343,9 +452,9 @@ def parse_natural_language_instructions(
 
     # 5. Parse the JSON. We expect either a JSON array or the string "null".
     try:
-        parsed_data = json.loads(json_str)
-    except json.JSONDecodeError as e:
-        print(f"JSON decode error: {e}")
+        parsed_data = orjson.loads(json_str)
+    except orjson.JSONDecodeError as e:
+        logger.warning("JSON decode error: %s", e)
         return None
 
     # 6. If "null" (as a string) or data not recognized, return None
@@ -355,7 +464,7 @@ def parse_natural_language_instructions(
 
     # 7. Our expected structure is a list of objects if not "null"
     if not isinstance(parsed_data, list):
-        print("Parsed data is not a list - returning None.")
+        logger.debug("Parsed data is not a list - returning None.")
         return None
 
     final_actions = []
@@ -363,22 +472,18 @@ def parse_natural_language_instructions(
     # 8. Iterate through each object in the array
     for item in parsed_data:
         if not isinstance(item, dict):
-            print("Array item is not a dict - invalid format.")
+            logger.debug("Array item is not a dict - invalid format.")
             return None
 
         intent = item.get("intent")
 
         # ADD SCHEDULE
         if intent == "add_schedule":
-            start_dt = parse_datetime(item.get("start_time", ""))
-            end_dt = (
-                parse_datetime(item.get("end_time", ""))
-                if item.get("end_time")
-                else None
-            )
+            start_dt = parse_datetime(item.get("start_time"))
+            end_dt = parse_datetime(item.get("end_time"))
             image = item.get("image", "")
             if not start_dt:
-                print("No valid start_time found for add_schedule item.")
+                logger.debug("No valid start_time found for add_schedule item.")
                 return None
             action = {
                 "intent": "add_schedule",
@@ -395,18 +500,14 @@ def parse_natural_language_instructions(
             existing_start_str = item.get("existing_start_time", "")
             new_title = item.get("new_title")
             new_start_str = item.get("new_start_time", "")
-            new_end = (
-                parse_datetime(item.get("new_end_time", ""))
-                if item.get("new_end_time")
-                else None
-            )
+            new_end = parse_datetime(item.get("new_end_time"))
 
             existing_start_dt = parse_datetime(existing_start_str)
             new_start_dt = parse_datetime(new_start_str)
 
             # If there's literally no update info:
             if not schedule_id and not new_title and not new_start_dt and not new_end:
-                print("No update info provided for update_schedule item.")
+                logger.debug("No update info provided for update_schedule item.")
                 return None
 
             action = {
@@ -424,7 +525,7 @@ def parse_natural_language_instructions(
             schedule_id = item.get("schedule_identifier", "")
             existing_start_str = item.get("existing_start_time", "")
             if not schedule_id:
-                print("No schedule_id found for delete_schedule item.")
+                logger.debug("No schedule_id found for delete_schedule item.")
                 return None
 
             existing_start_dt = parse_datetime(existing_start_str)
@@ -437,9 +538,9 @@ def parse_natural_language_instructions(
 
         else:
             # Unrecognized intent
-            print(f"Unrecognized intent in item: {item}")
+            logger.debug("Unrecognized intent in item: %r", item)
             return None
         
-    print(final_actions)
+    logger.debug("Parsed schedule actions: %r", final_actions)
 
     return final_actions if final_actions else None
@@ -1,6 +1,6 @@
 # app/models/chat_model.py
 
-from db import db, get_collection
+from db import get_collection
 from bson.objectid import ObjectId
 from datetime import datetime, timezone
 
@@ -8,9 +8,12 @@ from datetime import datetime, timezone
 chat_collection = get_collection(
     "chats",
     indexes=[
-        [("user_id", 1)],  # Index on user_id for faster lookups
+        # Equality on user_id, then the updated_at range for "chats after date"
+        [("user_id", 1), ("updated_at", -1)],
         [("updated_at", -1)],  # Index on updated_at for sorting
     ],
+    # Superseded by the prefix of the compound index
+    obsolete_indexes=["user_id_1"],
 )
 
 
@@ -1,10 +1,10 @@
-from db import db  # Import the initialized db object
+from db import get_collection
 from bson.objectid import ObjectId
 from datetime import datetime, timezone
 from pymongo.errors import PyMongoError
 
 # Collection reference
-other_collection = db["others"]
+other_collection = get_collection("others")
 
 
 # Other schema
@@ -107,6 +107,50 @@ def create_other(other_data):
         raise Exception(f"Failed to create other information: {e}")
 
 
+# Function to create several pieces of information at once
+def create_others_bulk(others_data):
+    """
+    Inserts multiple pieces of information into the MongoDB collection in a single round trip.
+
+    Args:
+        others_data (list): A list of information dictionaries, each in the format
+            accepted by `create_other`.
+
+    Returns:
+        list: The IDs of the newly created information as strings, in input order.
+
+    Raises:
+        ValueError: If any entry is missing required fields or is invalid.
+        pymongo.errors.PyMongoError: If there is a database-related error.
+    """
+    if not others_data:
+        return []
+
+    try:
+        # Validate everything up front so nothing is written for a bad batch
+        for other_data in others_data:
+            for field in ("user_id", "content"):
+                if field not in other_data or not other_data[field]:
+                    raise ValueError(
+                        f"'{field}' is a required field and cannot be empty."
+                    )
+
+        now = datetime.now(timezone.utc)
+        docs = [
+            OtherModel(
+                **{"created_at": now, "updated_at": now, **other_data}
+            ).to_dict()
+            for other_data in others_data
+        ]
+        result = other_collection.insert_many(docs, ordered=False)
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+    except ValueError as ve:
+        raise ValueError(f"Validation Error: {ve}")
+    except Exception as e:
+        raise Exception(f"Failed to create other information: {e}")
+
+
 # Function to find information by ID
 def find_other_by_id(other_id):
     """
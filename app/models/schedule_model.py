@@ -1,17 +1,31 @@
-from db import db, get_collection  # Import the initialized db object
-from bson.objectid import ObjectId
+from db import get_collection, fields_projection, to_object_id
+from bson import ObjectId, encode
+from bson.errors import InvalidId
+from bson.raw_bson import RawBSONDocument
 from datetime import datetime, timezone, timedelta
 from pymongo.errors import PyMongoError
+from pymongo.write_concern import WriteConcern
 
 # Collection reference
 schedule_collection = get_collection(
     "schedules",
     indexes=[
-        [("user_id", 1)],  # Index for filtering by user_id
-        [("schedule_date", 1)],  # Index for filtering by schedule_date
+        # Equality on user_id first, then the schedule_date range/sort; the
+        # user_id prefix also serves queries that filter by user_id alone
+        [("user_id", 1), ("schedule_date", 1)],
     ],
+    # Superseded by the compound index; nothing filters by schedule_date alone
+    obsolete_indexes=["user_id_1", "schedule_date_1"],
 )
 
+# Bulk cleanup only needs the primary's acknowledgement, not a majority wait
+_schedule_cleanup_collection = schedule_collection.with_options(
+    write_concern=WriteConcern(w=1)
+)
+
+# Fields that must be present and non-empty when creating a schedule
+_SCHEDULE_REQUIRED = ("user_id", "reminder_message", "schedule_date", "schedule_end_date")
+
 
 # Schedule schema
 class ScheduleModel:
@@ -42,6 +56,19 @@ class ScheduleModel:
             Converts the ScheduleModel instance to a dictionary format suitable for MongoDB insertion.
     """
 
+    __slots__ = (
+        "user_id",
+        "reminder_message",
+        "schedule_date",
+        "schedule_end_date",
+        "recurrence",
+        "status",
+        "event_id",
+        "image",
+        "created_at",
+        "updated_at",
+    )
+
     def __init__(
         self,
         user_id,
@@ -80,9 +107,11 @@ class ScheduleModel:
         self.status = status  # Pending, Completed, Skipped
         self.event_id = event_id  # Google Calendar event ID (if synced)
         self.image = image  # Image name
-        self.created_at = created_at or datetime.now(timezone.utc)  # Creation timestamp
-        self.updated_at = updated_at or datetime.now(
-            timezone.utc
+        if created_at is None:
+            created_at = datetime.now(timezone.utc)
+        self.created_at = created_at  # Creation timestamp
+        self.updated_at = (
+            created_at if updated_at is None else updated_at
         )  # Last update timestamp
 
     def to_dict(self):
@@ -103,7 +132,7 @@ class ScheduleModel:
                 - "updated_at" (datetime): The last update timestamp of the schedule.
         """
         schedule_dict = {
-            "user_id": ObjectId(self.user_id),
+            "user_id": to_object_id(self.user_id),
             "reminder_message": self.reminder_message,
             "schedule_date": self.schedule_date,
             "schedule_end_date": self.schedule_end_date,  # NEW
@@ -118,6 +147,84 @@ class ScheduleModel:
         return schedule_dict
 
 
+def _make_schedule_dict(schedule_data, now):
+    """
+    Builds the MongoDB document for a validated schedule without a ScheduleModel.
+
+    Produces the same document as `ScheduleModel(**schedule_data).to_dict()` and is
+    used on the bulk insert path, where the intermediate object is pure overhead.
+
+    Args:
+        schedule_data (dict): A validated schedule payload.
+        now (datetime): The timestamp to use when created_at/updated_at are not given.
+
+    Returns:
+        dict: The schedule document, ready for insertion.
+    """
+    created_at = schedule_data.get("created_at")
+    if created_at is None:
+        created_at = now
+    updated_at = schedule_data.get("updated_at")
+    schedule_dict = {
+        "user_id": to_object_id(schedule_data["user_id"]),
+        "reminder_message": schedule_data["reminder_message"],
+        "schedule_date": schedule_data["schedule_date"],
+        "schedule_end_date": schedule_data["schedule_end_date"],
+        "recurrence": schedule_data.get("recurrence"),
+        "status": schedule_data.get("status", "Pending"),
+        "image": schedule_data.get("image"),
+        "created_at": created_at,
+        "updated_at": created_at if updated_at is None else updated_at,
+    }
+    event_id = schedule_data.get("event_id")
+    if event_id:
+        schedule_dict["event_id"] = event_id
+    return schedule_dict
+
+
+def _validate_schedule_data(schedule_data):
+    """
+    Validates a schedule payload and normalizes its dates to UTC in place.
+
+    Args:
+        schedule_data (dict): The schedule details, in the format accepted by `create_schedule`.
+
+    Returns:
+        dict: The same dictionary, with 'schedule_date' and 'schedule_end_date' converted to UTC.
+
+    Raises:
+        ValueError: If required fields are missing or invalid.
+    """
+    # Validate required fields, reporting every missing one at once
+    values = tuple(schedule_data.get(field) for field in _SCHEDULE_REQUIRED)
+    if not all(values):
+        missing = [
+            field for field, value in zip(_SCHEDULE_REQUIRED, values) if not value
+        ]
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+    # Ensure schedule_date is a valid datetime object
+    if not isinstance(schedule_data["schedule_date"], datetime):
+        raise ValueError("'schedule_date' must be a valid datetime object.")
+
+    # Ensure schedule_end_date is a valid datetime object
+    if not isinstance(schedule_data["schedule_end_date"], datetime):
+        raise ValueError("'schedule_end_date' must be a valid datetime object.")
+
+    # Ensure that schedule_end_date >= schedule_date
+    if schedule_data["schedule_end_date"] < schedule_data["schedule_date"]:
+        raise ValueError("'schedule_end_date' cannot be before 'schedule_date'.")
+
+    # Convert schedule_date and schedule_end_date to UTC
+    schedule_data["schedule_date"] = schedule_data["schedule_date"].astimezone(
+        timezone.utc
+    )
+    schedule_data["schedule_end_date"] = schedule_data["schedule_end_date"].astimezone(
+        timezone.utc
+    )
+    return schedule_data
+
+
 # Function to create a new schedule
 def create_schedule(schedule_data):
     """
@@ -145,46 +252,61 @@ def create_schedule(schedule_data):
         Always ensure that 'schedule_end_date' >= 'schedule_date'. Otherwise it may cause unexpected logic issues.
     """
     try:
-        # Validate required fields
-        required_fields = [
-            "user_id",
-            "reminder_message",
-            "schedule_date",
-            "schedule_end_date",
-        ]
-        for field in required_fields:
-            if field not in schedule_data or not schedule_data[field]:
-                raise ValueError(f"'{field}' is a required field and cannot be empty.")
+        # Create and insert the schedule
+        schedule = ScheduleModel(**_validate_schedule_data(schedule_data))
+        result = schedule_collection.insert_one(schedule.to_dict())
+        return str(result.inserted_id)
 
-        # Ensure schedule_date is a valid datetime object
-        if not isinstance(schedule_data["schedule_date"], datetime):
-            raise ValueError("'schedule_date' must be a valid datetime object.")
+    except ValueError as ve:
+        raise ValueError(f"Validation Error: {ve}")
+    except Exception as e:
+        raise Exception(f"Failed to create schedule: {e}")
 
-        # Ensure schedule_end_date is a valid datetime object
-        if not isinstance(schedule_data["schedule_end_date"], datetime):
-            raise ValueError("'schedule_end_date' must be a valid datetime object.")
 
-        # Ensure that schedule_end_date >= schedule_date
-        if schedule_data["schedule_end_date"] < schedule_data["schedule_date"]:
-            raise ValueError("'schedule_end_date' cannot be before 'schedule_date'.")
+def create_schedules_bulk(schedules_data):
+    """
+    Inserts multiple schedules into the MongoDB collection in a single round trip.
 
-        # Convert schedule_date and schedule_end_date to ISO format
-        schedule_data["schedule_date"] = schedule_data["schedule_date"].astimezone(
-            timezone.utc
-        )
-        schedule_data["schedule_end_date"] = schedule_data[
-            "schedule_end_date"
-        ].astimezone(timezone.utc)
+    All schedules are validated before anything is written. The insert is unordered, so
+    one failing document does not stop the rest from being inserted.
 
-        # Create and insert the schedule
-        schedule = ScheduleModel(**schedule_data)
-        result = schedule_collection.insert_one(schedule.to_dict())
-        return str(result.inserted_id)
+    Args:
+        schedules_data (list): A list of schedule dictionaries, each in the format
+            accepted by `create_schedule`.
+
+    Returns:
+        list: The IDs of the newly created schedules as strings, in input order.
+
+    Raises:
+        ValueError: If any schedule is missing required fields or is invalid.
+        pymongo.errors.PyMongoError: If there is a database-related error.
+    """
+    if not schedules_data:
+        return []
+
+    try:
+        # One timestamp for the whole batch
+        now = datetime.now(timezone.utc)
+        docs = []
+        inserted_ids = []
+        for schedule_data in schedules_data:
+            schedule_dict = _make_schedule_dict(
+                _validate_schedule_data(schedule_data), now
+            )
+            # Raw documents are sent as-is, so the _id must be assigned up front
+            schedule_dict["_id"] = ObjectId()
+            inserted_ids.append(str(schedule_dict["_id"]))
+            # Encode once; retries resend the same bytes instead of re-encoding
+            docs.append(RawBSONDocument(encode(schedule_dict)))
+        # insert_many leaves raw documents out of inserted_ids, so the IDs assigned
+        # above are returned instead
+        schedule_collection.insert_many(docs, ordered=False)
+        return inserted_ids
 
     except ValueError as ve:
         raise ValueError(f"Validation Error: {ve}")
     except Exception as e:
-        raise Exception(f"Failed to create schedule: {e}")
+        raise Exception(f"Failed to create schedules: {e}")
 
 
 # Function to find a schedule by ID
@@ -204,11 +326,13 @@ def find_schedule_by_id(schedule_id):
     """
     try:
         # Validate the schedule_id
-        if not ObjectId.is_valid(schedule_id):
+        try:
+            schedule_oid = to_object_id(schedule_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"'{schedule_id}' is not a valid ObjectId.")
 
         # Find the schedule in the database
-        schedule = schedule_collection.find_one({"_id": ObjectId(schedule_id)})
+        schedule = schedule_collection.find_one({"_id": schedule_oid})
         if not schedule:
             return None
         return schedule
@@ -220,13 +344,15 @@ def find_schedule_by_id(schedule_id):
 
 
 # Function to find all schedules for a user
-def find_schedules_by_user_id(user_id, amount=None):
+def find_schedules_by_user_id(user_id, amount=None, fields=None):
     """
     Finds schedules for a specific user, with an optional limit on the number of schedules.
 
     Args:
         user_id (str): The ID of the user whose schedules need to be fetched.
         amount (int, optional): The maximum number of schedules to fetch. If None, fetches all schedules.
+        fields (list, optional): Only return these fields. If they are all keys of the
+            (user_id, schedule_date) index, MongoDB serves the query from the index alone.
 
     Returns:
         list: A list of schedule documents associated with the user.
@@ -237,15 +363,17 @@ def find_schedules_by_user_id(user_id, amount=None):
     """
     try:
         # Validate the user_id
-        if not ObjectId.is_valid(user_id):
+        try:
+            user_oid = to_object_id(user_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"'{user_id}' is not a valid ObjectId.")
 
         # Fetch schedules for the user with an optional limit
-        query = {"user_id": ObjectId(user_id)}
-        if amount is None:
-            schedules = list(schedule_collection.find(query))
-        else:
-            schedules = list(schedule_collection.find(query).limit(amount))
+        query = {"user_id": user_oid}
+        cursor = schedule_collection.find(query, fields_projection(fields))
+        if amount is not None:
+            cursor = cursor.limit(amount)
+        schedules = list(cursor)
         return schedules
 
     except ValueError as ve:
@@ -273,7 +401,9 @@ def get_schedules_within_range(user_id, time_range, range_type="days"):
     """
     try:
         # Validate the user_id
-        if not ObjectId.is_valid(user_id):
+        try:
+            user_oid = to_object_id(user_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"'{user_id}' is not a valid ObjectId.")
 
         # Validate the range_type
@@ -300,7 +430,7 @@ def get_schedules_within_range(user_id, time_range, range_type="days"):
         schedules = list(
             schedule_collection.find(
                 {
-                    "user_id": ObjectId(user_id),
+                    "user_id": user_oid,
                     "schedule_date": {"$gte": start_time, "$lte": end_time},
                 }
             )
@@ -332,7 +462,9 @@ def get_schedules_in_date_range(user_id, start_date, end_date):
     """
     try:
         # Validate the user_id
-        if not ObjectId.is_valid(user_id):
+        try:
+            user_oid = to_object_id(user_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"'{user_id}' is not a valid ObjectId.")
 
         # Ensure start_date and end_date are timezone-aware and in UTC
@@ -350,7 +482,7 @@ def get_schedules_in_date_range(user_id, start_date, end_date):
         schedules = list(
             schedule_collection.find(
                 {
-                    "user_id": ObjectId(user_id),
+                    "user_id": user_oid,
                     "schedule_date": {"$gte": start_date, "$lte": end_date},
                 }
             ).sort(
@@ -384,7 +516,9 @@ def find_schedule_by_name_and_datetime(user_id, reminder_message, schedule_date)
     """
     try:
         # 1) Validate user_id
-        if not ObjectId.is_valid(user_id):
+        try:
+            user_oid = to_object_id(user_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"'{user_id}' is not a valid ObjectId.")
 
         # 2) Make sure we have a valid datetime
@@ -394,7 +528,7 @@ def find_schedule_by_name_and_datetime(user_id, reminder_message, schedule_date)
         # 3) Query
         schedule = schedule_collection.find_one(
             {
-                "user_id": ObjectId(user_id),
+                "user_id": user_oid,
                 "reminder_message": reminder_message,
                 "schedule_date": schedule_date,
             }
@@ -425,7 +559,9 @@ def update_schedule(schedule_id, updates):
     """
     try:
         # Validate the schedule_id
-        if not ObjectId.is_valid(schedule_id):
+        try:
+            schedule_oid = to_object_id(schedule_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"'{schedule_id}' is not a valid ObjectId.")
 
         # Ensure updates are provided
@@ -433,7 +569,7 @@ def update_schedule(schedule_id, updates):
             raise ValueError("The 'updates' argument must be a non-empty dictionary.")
 
         # Retrieve the existing schedule to validate date constraints
-        existing_schedule = schedule_collection.find_one({"_id": ObjectId(schedule_id)})
+        existing_schedule = schedule_collection.find_one({"_id": schedule_oid})
         if not existing_schedule:
             raise ValueError(f"No schedule found with ID '{schedule_id}'.")
 
@@ -478,7 +614,7 @@ def update_schedule(schedule_id, updates):
 
         # Perform the update
         result = schedule_collection.update_one(
-            {"_id": ObjectId(schedule_id)}, {"$set": updates}
+            {"_id": schedule_oid}, {"$set": updates}
         )
         return result.modified_count
 
@@ -504,11 +640,13 @@ def delete_schedule(schedule_id):
     """
     try:
         # Validate the schedule_id
-        if not ObjectId.is_valid(schedule_id):
+        try:
+            schedule_oid = to_object_id(schedule_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"'{schedule_id}' is not a valid ObjectId.")
 
         # Perform the delete operation
-        result = schedule_collection.delete_one({"_id": ObjectId(schedule_id)})
+        result = schedule_collection.delete_one({"_id": schedule_oid})
         return result.deleted_count
 
     except ValueError as ve:
@@ -517,6 +655,41 @@ def delete_schedule(schedule_id):
         raise Exception(f"Failed to delete schedule with ID '{schedule_id}': {e}")
 
 
+def delete_schedules_bulk(schedule_ids):
+    """
+    Deletes several schedules by ID in a single round trip.
+
+    Args:
+        schedule_ids (list): The IDs of the schedules to delete.
+
+    Returns:
+        int: The number of documents deleted.
+
+    Raises:
+        ValueError: If any of the provided schedule_ids is not a valid ObjectId.
+        pymongo.errors.PyMongoError: If there is a database-related error.
+    """
+    if not schedule_ids:
+        return 0
+
+    try:
+        schedule_oids = []
+        for schedule_id in schedule_ids:
+            try:
+                schedule_oids.append(to_object_id(schedule_id))
+            except (InvalidId, TypeError):
+                raise ValueError(f"'{schedule_id}' is not a valid ObjectId.")
+
+        # One $in filter matches every requested schedule in a single command
+        result = schedule_collection.delete_many({"_id": {"$in": schedule_oids}})
+        return result.deleted_count
+
+    except ValueError as ve:
+        raise ValueError(f"Validation Error: {ve}")
+    except Exception as e:
+        raise Exception(f"Failed to delete schedules: {e}")
+
+
 def delete_all_schedules_for_user(user_id):
     """
     Deletes all schedules for a specific user.
@@ -533,11 +706,15 @@ def delete_all_schedules_for_user(user_id):
     """
     try:
         # Validate the user_id
-        if not ObjectId.is_valid(user_id):
+        try:
+            user_oid = to_object_id(user_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"'{user_id}' is not a valid ObjectId.")
 
         # Perform the delete operation
-        result = schedule_collection.delete_many({"user_id": ObjectId(user_id)})
+        result = _schedule_cleanup_collection.delete_many(
+            {"user_id": user_oid}, comment="delete_all_schedules_for_user"
+        )
         return result.deleted_count
 
     except ValueError as ve:
@@ -1,17 +1,22 @@
 from config import config
-from db import db, get_collection
-from bson.objectid import ObjectId
+from db import get_collection, fields_projection, to_object_id
 from datetime import datetime, timezone
+from pymongo import DeleteOne, UpdateOne
 
 # Collection reference
 tokens_collection = get_collection(
     "tokens",
     indexes=[
-        [("user_id", 1)],  # Index for filtering by user_id
-        [("service_name", 1)],  # Index for filtering by service_name
+        # Compound index for user_id + service_name lookups; its user_id prefix
+        # also serves queries that filter by user_id alone
+        [("user_id", 1), ("service_name", 1)],
     ],
+    # Superseded by the compound index; nothing filters by service_name alone
+    obsolete_indexes=["user_id_1", "service_name_1"],
 )
 
+# The token fields needed to call a Google API or refresh its access token
+TOKEN_CREDENTIAL_FIELDS = ("access_token", "refresh_token", "token_expiry")
 
 
 class TokenModel:
@@ -27,6 +32,16 @@ class TokenModel:
         updated_at (datetime): Timestamp of last token update.
     """
 
+    __slots__ = (
+        "user_id",
+        "service_name",
+        "access_token",
+        "refresh_token",
+        "token_expiry",
+        "created_at",
+        "updated_at",
+    )
+
     def __init__(
         self,
         user_id,
@@ -37,13 +52,15 @@ class TokenModel:
         created_at=None,
         updated_at=None,
     ):
-        self.user_id = ObjectId(user_id)
+        self.user_id = to_object_id(user_id)
         self.service_name = service_name
         self.access_token = access_token
         self.refresh_token = refresh_token
         self.token_expiry = token_expiry
-        self.created_at = created_at or datetime.now(timezone.utc)
-        self.updated_at = updated_at or datetime.now(timezone.utc)
+        if created_at is None:
+            created_at = datetime.now(timezone.utc)
+        self.created_at = created_at
+        self.updated_at = created_at if updated_at is None else updated_at
 
     def to_dict(self):
         return {
@@ -67,20 +84,53 @@ def create_token(token_data):
         raise Exception(f"Failed to create token: {e}")
 
 
-# Find a token by user_id and service_name
-def find_token_by_user_and_service(user_id, service_name):
+def create_tokens_bulk(tokens_data):
+    """
+    Inserts multiple tokens in a single round trip.
+
+    Args:
+        tokens_data (list): A list of token dictionaries, each in the format accepted by `create_token`.
+
+    Returns:
+        list: The IDs of the newly created tokens as strings, in input order.
+    """
+    if not tokens_data:
+        return []
+
+    try:
+        # One timestamp for the whole batch
+        now = datetime.now(timezone.utc)
+        docs = [
+            TokenModel(
+                **{"created_at": now, "updated_at": now, **token_data}
+            ).to_dict()
+            for token_data in tokens_data
+        ]
+        result = tokens_collection.insert_many(docs, ordered=False)
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    except Exception as e:
+        raise Exception(f"Failed to create tokens: {e}")
+
+
+# Find a token by user_id and service_name; pass `fields` to fetch only what the caller reads
+def find_token_by_user_and_service(user_id, service_name, fields=None):
     try:
         token = tokens_collection.find_one(
-            {"user_id": ObjectId(user_id), "service_name": service_name}
+            {"user_id": to_object_id(user_id), "service_name": service_name},
+            fields_projection(fields),
         )
         return token
     except Exception as e:
         raise Exception(f"Failed to find token for user and service: {e}")
 
 
-def find_tokens_by_user(user_id):
+# Find all tokens for a user; pass `fields` to skip fetching unused token fields.
+# A projection of (user_id, service_name) is covered by the compound index.
+def find_tokens_by_user(user_id, fields=None):
     try:
-        tokens = tokens_collection.find({"user_id": ObjectId(user_id)})
+        tokens = tokens_collection.find(
+            {"user_id": to_object_id(user_id)}, fields_projection(fields)
+        )
         return tokens
     except Exception as e:
         raise Exception(f"Failed to find tokens for user: {e}")
@@ -91,7 +141,7 @@ def update_token(user_id, service_name, updates):
     try:
         updates["updated_at"] = datetime.now(timezone.utc)
         result = tokens_collection.update_one(
-            {"user_id": ObjectId(user_id), "service_name": service_name},
+            {"user_id": to_object_id(user_id), "service_name": service_name},
             {"$set": updates},
         )
         return result.modified_count
@@ -99,12 +149,48 @@ def update_token(user_id, service_name, updates):
         raise Exception(f"Failed to update token: {e}")
 
 
+# Update many tokens in one round trip; `ops` is a list of (user_id, service_name, updates)
+def bulk_update_tokens(ops):
+    if not ops:
+        return 0
+
+    try:
+        now = datetime.now(timezone.utc)
+        requests = [
+            UpdateOne(
+                {"user_id": to_object_id(user_id), "service_name": service_name},
+                {"$set": {**updates, "updated_at": now}},
+            )
+            for user_id, service_name, updates in ops
+        ]
+        result = tokens_collection.bulk_write(requests, ordered=False)
+        return result.modified_count
+    except Exception as e:
+        raise Exception(f"Failed to update tokens: {e}")
+
+
 # Delete a token
 def delete_token(user_id, service_name):
     try:
         result = tokens_collection.delete_one(
-            {"user_id": ObjectId(user_id), "service_name": service_name}
+            {"user_id": to_object_id(user_id), "service_name": service_name}
         )
         return result.deleted_count
     except Exception as e:
         raise Exception(f"Failed to delete token: {e}")
+
+
+# Delete many tokens in one round trip; `ops` is a list of (user_id, service_name)
+def bulk_delete_tokens(ops):
+    if not ops:
+        return 0
+
+    try:
+        requests = [
+            DeleteOne({"user_id": to_object_id(user_id), "service_name": service_name})
+            for user_id, service_name in ops
+        ]
+        result = tokens_collection.bulk_write(requests, ordered=False)
+        return result.deleted_count
+    except Exception as e:
+        raise Exception(f"Failed to delete tokens: {e}")
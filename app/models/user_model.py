@@ -1,9 +1,39 @@
-from db import db  # Import the initialized db object
-from datetime import datetime
-from bson.objectid import ObjectId  # Import ObjectId to handle MongoDB IDs
+from db import get_collection, to_object_id
+from pymongo import IndexModel
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timezone
+from bson.errors import InvalidId
+from cachetools import TTLCache
+from threading import Lock
 
 # Collection reference
-user_collection = db["users"]
+user_collection = get_collection(
+    "users",
+    indexes=[
+        # Logins look users up by email; both fields must be unique per user
+        IndexModel([("email", 1)], unique=True),
+        IndexModel([("username", 1)], unique=True),
+    ],
+)
+
+_UTC = timezone.utc
+
+# Fields that must be present when creating a user
+_USER_REQUIRED = frozenset(
+    {"username", "email", "password", "phone_number", "nationality", "age"}
+)
+
+# Profile fields the chat flow reads on every message; the password hash is never
+# cached. Entries are dropped on writes to the user
+_USER_PROFILE_PROJECTION = {"username": 1}
+_user_profile_cache = TTLCache(maxsize=5000, ttl=60)
+_user_profile_cache_lock = Lock()
+
+
+def _invalidate_user_profile(user_id):
+    """Drops the cached profile of a user after a write."""
+    with _user_profile_cache_lock:
+        _user_profile_cache.pop(str(user_id), None)
 
 
 # User schema for validation
@@ -27,6 +57,17 @@ class UserModel:
             insertion into MongoDB.
     """
 
+    __slots__ = (
+        "username",
+        "email",
+        "password",
+        "phone_number",
+        "nationality",
+        "age",
+        "creation_date",
+        "ai_id",
+    )
+
     def __init__(
         self,
         username,
@@ -58,7 +99,7 @@ class UserModel:
         self.phone_number = phone_number
         self.nationality = nationality
         self.age = age
-        self.creation_date = creation_date or datetime.utcnow()
+        self.creation_date = creation_date or datetime.now(_UTC)
         self.ai_id = ai_id  # Foreign key reference to AI document
 
     def to_dict(self):
@@ -107,21 +148,16 @@ def create_user(user_data):
 
     Raises:
         ValueError: If `user_data` is missing required fields or is not in the expected format.
+        pymongo.errors.DuplicateKeyError: If the username or email is already taken.
         pymongo.errors.PyMongoError: For any MongoDB operation failure.
     """
     try:
         # Validate that required fields are present in user_data
-        required_fields = [
-            "username",
-            "email",
-            "password",
-            "phone_number",
-            "nationality",
-            "age",
-        ]
-        missing_fields = [field for field in required_fields if field not in user_data]
+        missing_fields = _USER_REQUIRED - user_data.keys()
         if missing_fields:
-            raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
+            raise ValueError(
+                f"Missing required fields: {', '.join(sorted(missing_fields))}"
+            )
 
         # Create a UserModel instance
         user = UserModel(**user_data)
@@ -134,17 +170,22 @@ def create_user(user_data):
         # Handle validation errors
         raise ValueError(f"Validation Error: {ve}") from ve
 
+    except DuplicateKeyError:
+        # Left as is, so callers can tell a taken username or email apart
+        raise
+
     except Exception as e:
         # Handle other potential exceptions, including database errors
         raise Exception(f"Failed to create user: {e}") from e
 
 
-def find_user_by_id(user_id):
+def find_user_by_id(user_id, projection=None):
     """
     Finds a user by their unique MongoDB ID.
 
     Args:
         user_id (str): The unique ID of the user as a string.
+        projection (dict, optional): Fields to include or exclude. Defaults to all fields.
 
     Returns:
         dict: A dictionary representing the user document if found.
@@ -156,11 +197,13 @@ def find_user_by_id(user_id):
     """
     try:
         # Validate that the user_id is a valid ObjectId
-        if not ObjectId.is_valid(user_id):
+        try:
+            user_oid = to_object_id(user_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"Invalid user ID: {user_id}")
 
         # Query the database for the user
-        user = user_collection.find_one({"_id": ObjectId(user_id)})
+        user = user_collection.find_one({"_id": user_oid}, projection)
         return user
 
     except ValueError as ve:
@@ -172,25 +215,92 @@ def find_user_by_id(user_id):
         raise Exception(f"Failed to find user by ID: {e}") from e
 
 
-def find_all_users():
+def find_user_profile(user_id):
     """
-    Fetches all users in the MongoDB collection.
+    Finds the profile fields of a user, reusing them for up to a minute after a
+    lookup. Missing users are not cached, so new accounts are found right away.
+
+    Args:
+        user_id (str): The unique ID of the user as a string.
 
     Returns:
-        list: A list of dictionaries where each dictionary represents a user document.
-              Returns an empty list if no users are found.
+        dict: A copy of the cached profile (the `_id` and `username`) if found.
+        None: If no user with the given ID exists.
 
     Raises:
+        ValueError: If the `user_id` is not a valid MongoDB ObjectId string.
+        pymongo.errors.PyMongoError: For any MongoDB operation failure.
+    """
+    key = str(user_id)
+    with _user_profile_cache_lock:
+        profile = _user_profile_cache.get(key)
+    if profile is None:
+        profile = find_user_by_id(user_id, _USER_PROFILE_PROJECTION)
+        if profile is None:
+            return None
+        with _user_profile_cache_lock:
+            _user_profile_cache[key] = profile
+    # Hand out a copy so callers cannot change the cached profile
+    return dict(profile)
+
+
+def update_user_password(user_id, password_hash):
+    """
+    Replaces the stored password hash of a user.
+
+    Args:
+        user_id (str | ObjectId): The unique ID of the user.
+        password_hash (str): The new password hash.
+
+    Returns:
+        int: The number of documents modified (0 or 1).
+
+    Raises:
+        ValueError: If the `user_id` is not a valid MongoDB ObjectId.
         pymongo.errors.PyMongoError: For any MongoDB operation failure.
     """
     try:
-        # Retrieve all user documents from the collection
-        users = list(user_collection.find())
-        return users
+        # Validate that the user_id is a valid ObjectId
+        try:
+            user_oid = to_object_id(user_id)
+        except (InvalidId, TypeError):
+            raise ValueError(f"Invalid user ID: {user_id}")
+
+        result = user_collection.update_one(
+            {"_id": user_oid}, {"$set": {"password": password_hash}}
+        )
+        _invalidate_user_profile(user_oid)
+        return result.modified_count
+
+    except ValueError as ve:
+        # Handle invalid ObjectId errors
+        raise ValueError(f"Validation Error: {ve}") from ve
 
     except Exception as e:
-        # Handle potential database operation failures
-        raise Exception(f"Failed to fetch users: {e}") from e
+        # Handle other potential exceptions, including database errors
+        raise Exception(f"Failed to update user password: {e}") from e
+
+
+def find_all_users(projection=None, limit=0, batch_size=1000):
+    """
+    Fetches all users in the MongoDB collection.
+
+    Args:
+        projection (dict, optional): Fields to include or exclude. Defaults to all fields.
+        limit (int, optional): Maximum number of users to return. 0 means no limit.
+        batch_size (int, optional): Number of documents fetched per round trip.
+
+    Returns:
+        pymongo.cursor.Cursor: A cursor over the user documents. Iterate it to stream
+              results instead of loading the whole collection into memory.
+
+    Raises:
+        pymongo.errors.PyMongoError: For any MongoDB operation failure. Raised while
+              iterating, since the query only runs when the cursor is consumed.
+    """
+    return user_collection.find(
+        {}, projection=projection, batch_size=batch_size
+    ).limit(limit)
 
 
 def delete_user(user_id):
@@ -210,11 +320,14 @@ def delete_user(user_id):
     """
     try:
         # Validate that the user_id is a valid ObjectId
-        if not ObjectId.is_valid(user_id):
+        try:
+            user_oid = to_object_id(user_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"Invalid user ID: {user_id}")
 
         # Perform the delete operation
-        result = user_collection.delete_one({"_id": ObjectId(user_id)})
+        result = user_collection.delete_one({"_id": user_oid})
+        _invalidate_user_profile(user_oid)
 
         # Return the result of the deletion
         return {"deleted_count": result.deleted_count}
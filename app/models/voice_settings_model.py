@@ -1,14 +1,23 @@
-from db import db, get_collection  # Import the initialized db object
+from db import get_collection, to_object_id
+from bson.errors import InvalidId
 
 # Collection reference
 voice_settings_collection = get_collection(
     "voice_settings",
     indexes=[
-        [("name", 1)],
-        [("language", 1)],
+        # Serves name lookups and combined name + language filters alike
+        [("name", 1), ("language", 1)],
     ],
+    # Superseded by the compound index; nothing filters by language alone
+    obsolete_indexes=["name_1", "language_1"],
 )
 
+# Fields that must be present when creating a voice setting
+_VOICE_SETTING_REQUIRED = frozenset({"name", "voice", "language"})
+
+# Default projection for listings: the schema fields plus _id
+_VOICE_SETTING_PROJECTION = {"name": 1, "voice": 1, "language": 1}
+
 
 # VoiceSettings schema
 class VoiceSettingsModel:
@@ -76,10 +85,11 @@ def create_voice_setting(data):
     """
     try:
         # Validate that required fields are present in data
-        required_fields = ["name", "voice", "language"]
-        missing_fields = [field for field in required_fields if field not in data]
+        missing_fields = _VOICE_SETTING_REQUIRED - data.keys()
         if missing_fields:
-            raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
+            raise ValueError(
+                f"Missing required fields: {', '.join(sorted(missing_fields))}"
+            )
 
         # Create a VoiceSettingsModel instance
         voice_setting = VoiceSettingsModel(**data)
@@ -92,17 +102,15 @@ def create_voice_setting(data):
         # Handle validation errors
         raise ValueError(f"Validation Error: {ve}") from ve
 
-    except Exception as e:
-        # Handle other potential exceptions, including database errors
-        raise Exception(f"Failed to create voice setting: {e}") from e
-
 
-def find_voice_setting_by_id(voice_id):
+def find_voice_setting_by_id(voice_id, projection=None):
     """
     Finds a voice setting by its unique MongoDB ID.
 
     Args:
         voice_id (str): The unique ID of the voice setting as a string.
+        projection (dict, optional): Fields to include or exclude. Defaults to the
+            voice setting fields (name, voice, language) and `_id`.
 
     Returns:
         dict: A dictionary representing the voice setting document if found.
@@ -112,30 +120,32 @@ def find_voice_setting_by_id(voice_id):
         ValueError: If the `voice_id` is not a valid MongoDB ObjectId string.
         pymongo.errors.PyMongoError: For any MongoDB operation failure.
     """
-    from bson.objectid import ObjectId  # Import ObjectId to handle MongoDB IDs
-
     try:
         # Validate that the voice_id is a valid ObjectId
-        if not ObjectId.is_valid(voice_id):
+        try:
+            voice_oid = to_object_id(voice_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"Invalid voice ID: {voice_id}")
 
         # Query the database for the voice setting
-        voice_setting = voice_settings_collection.find_one({"_id": ObjectId(voice_id)})
+        voice_setting = voice_settings_collection.find_one(
+            {"_id": voice_oid}, projection or _VOICE_SETTING_PROJECTION
+        )
         return voice_setting
 
     except ValueError as ve:
         # Handle invalid ObjectId errors
         raise ValueError(f"Validation Error: {ve}") from ve
 
-    except Exception as e:
-        # Handle other potential exceptions, including database errors
-        raise Exception(f"Failed to find voice setting by ID: {e}") from e
-
 
-def find_all_voice_settings():
+def find_all_voice_settings(projection=None):
     """
     Fetches all voice settings in the MongoDB collection.
 
+    Args:
+        projection (dict, optional): Fields to include or exclude. Defaults to the
+            voice setting fields (name, voice, language) and `_id`.
+
     Returns:
         list: A list of dictionaries where each dictionary represents a voice setting document.
               Returns an empty list if no voice settings are found.
@@ -143,14 +153,13 @@ def find_all_voice_settings():
     Raises:
         pymongo.errors.PyMongoError: For any MongoDB operation failure.
     """
-    try:
-        # Retrieve all voice setting documents from the collection
-        voice_settings = list(voice_settings_collection.find())
-        return voice_settings
-
-    except Exception as e:
-        # Handle database operation failures
-        raise Exception(f"Failed to fetch all voice settings: {e}") from e
+    # Retrieve all voice setting documents from the collection
+    voice_settings = list(
+        voice_settings_collection.find(
+            {}, projection=projection or _VOICE_SETTING_PROJECTION
+        ).batch_size(500)
+    )
+    return voice_settings
 
 
 def delete_voice_setting(voice_id):
@@ -167,21 +176,17 @@ def delete_voice_setting(voice_id):
         ValueError: If the `voice_id` is not a valid MongoDB ObjectId string.
         pymongo.errors.PyMongoError: For any MongoDB operation failure.
     """
-    from bson.objectid import ObjectId  # Import ObjectId to handle MongoDB IDs
-
     try:
         # Validate that the voice_id is a valid ObjectId
-        if not ObjectId.is_valid(voice_id):
+        try:
+            voice_oid = to_object_id(voice_id)
+        except (InvalidId, TypeError):
             raise ValueError(f"Invalid voice ID: {voice_id}")
 
         # Perform the delete operation
-        result = voice_settings_collection.delete_one({"_id": ObjectId(voice_id)})
+        result = voice_settings_collection.delete_one({"_id": voice_oid})
         return result.deleted_count
 
     except ValueError as ve:
         # Handle invalid ObjectId errors
         raise ValueError(f"Validation Error: {ve}") from ve
-
-    except Exception as e:
-        # Handle other potential exceptions, including database errors
-        raise Exception(f"Failed to delete voice setting: {e}") from e
@@ -5,6 +5,10 @@ from app.views.auth_view import signup, login, get_user
 auth_routes = Blueprint("auth", __name__)
 
 # Assign controller functions to routes
-auth_routes.add_url_rule("/signup", view_func=signup, methods=["POST"])
-auth_routes.add_url_rule("/login", view_func=login, methods=["POST"])
-auth_routes.add_url_rule("/user", view_func=get_user, methods=["GET"])
+auth_routes.add_url_rule(
+    "/signup", view_func=signup, endpoint="signup", methods=["POST"]
+)
+auth_routes.add_url_rule("/login", view_func=login, endpoint="login", methods=["POST"])
+auth_routes.add_url_rule(
+    "/user", view_func=get_user, endpoint="get_user", methods=["GET"]
+)
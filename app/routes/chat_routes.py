@@ -11,10 +11,22 @@ from app.views.chat_view import (
 
 chat_routes = Blueprint("chat", __name__)
 
-chat_routes.add_url_rule("/", view_func=chat, methods=["POST"])
-chat_routes.add_url_rule("/", view_func=get_chats, methods=["GET"])
-chat_routes.add_url_rule("/<chat_id>", view_func=get_chat_by_id, methods=["GET"])
+chat_routes.add_url_rule("/", view_func=chat, endpoint="chat", methods=["POST"])
 chat_routes.add_url_rule(
-    "/after/<date_str>", view_func=get_chats_after_datetime, methods=["GET"]
+    "/", view_func=get_chats, endpoint="get_chats", methods=["GET"]
+)
+chat_routes.add_url_rule(
+    "/<chat_id>", view_func=get_chat_by_id, endpoint="get_chat_by_id", methods=["GET"]
+)
+chat_routes.add_url_rule(
+    "/after/<date_str>",
+    view_func=get_chats_after_datetime,
+    endpoint="get_chats_after_datetime",
+    methods=["GET"],
+)
+chat_routes.add_url_rule(
+    "/<chat_id>",
+    view_func=delete_chat_by_id,
+    endpoint="delete_chat_by_id",
+    methods=["DELETE"],
 )
-chat_routes.add_url_rule("/<chat_id>", view_func=delete_chat_by_id, methods=["DELETE"])
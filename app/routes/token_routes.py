@@ -15,6 +15,7 @@ token_routes = Blueprint("token", __name__)
 token_routes.add_url_rule(
     "/auth/google/<service_name>",
     view_func=add_google_access_and_refresh_token,
+    endpoint="add_google_access_and_refresh_token",
     methods=["POST"],
 )
 
@@ -22,15 +23,23 @@ token_routes.add_url_rule(
 token_routes.add_url_rule(
     "/auth/google/<service_name>/refresh",
     view_func=refresh_google_access_token_view,
+    endpoint="refresh_google_access_token_view",
     methods=["POST"],
 )
 
 # Other routes remain the same
-token_routes.add_url_rule("/", view_func=add_token, methods=["POST"])  # Create a token
-token_routes.add_url_rule("/", view_func=get_all_tokens, methods=["GET"])  # Get tokens
 token_routes.add_url_rule(
-    "/<service_name>", view_func=get_token, methods=["GET"]
+    "/", view_func=add_token, endpoint="add_token", methods=["POST"]
+)  # Create a token
+token_routes.add_url_rule(
+    "/", view_func=get_all_tokens, endpoint="get_all_tokens", methods=["GET"]
+)  # Get tokens
+token_routes.add_url_rule(
+    "/<service_name>", view_func=get_token, endpoint="get_token", methods=["GET"]
 )  # Get a token based on the service name
 token_routes.add_url_rule(
-    "/<service_name>", view_func=delete_token, methods=["DELETE"]
+    "/<service_name>",
+    view_func=delete_token,
+    endpoint="delete_token",
+    methods=["DELETE"],
 )  # Delete a token based on the service name
@@ -1,7 +1,26 @@
 from google_auth_oauthlib.flow import Flow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
+
+# OAuth scopes requested when a user connects their Google account
+_GOOGLE_OAUTH_SCOPES = (
+    "openid",
+    "https://www.googleapis.com/auth/userinfo.email",
+    "https://www.googleapis.com/auth/classroom.courses.readonly",
+    "https://www.googleapis.com/auth/classroom.coursework.me",
+    "https://www.googleapis.com/auth/userinfo.profile",
+    "https://www.googleapis.com/auth/calendar.readonly",
+    "https://www.googleapis.com/auth/classroom.student-submissions.me.readonly",
+    "https://www.googleapis.com/auth/classroom.announcements.readonly",
+)
+
+_GOOGLE_AUTH_URI = "https://accounts.google.com/o/oauth2/auth"
+_GOOGLE_TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+# Stored tokens this close to expiry are refreshed before use, so they cannot lapse
+# in the middle of a sync
+_TOKEN_EXPIRY_LEEWAY = timedelta(minutes=1)
 
 
 def refresh_google_access_token(refresh_token, client_id, client_secret):
@@ -30,7 +49,7 @@ def refresh_google_access_token(refresh_token, client_id, client_secret):
         creds = Credentials(
             token=None,
             refresh_token=refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
+            token_uri=_GOOGLE_TOKEN_URI,
             client_id=client_id,
             client_secret=client_secret,
         )
@@ -50,6 +69,43 @@ def refresh_google_access_token(refresh_token, client_id, client_secret):
         raise Exception(f"Failed to refresh token: {str(e)}")
 
 
+def get_valid_access_token(token_data, client_id, client_secret):
+    """
+    Returns a usable access token from stored token data, refreshing it only when it
+    has expired or is about to.
+
+    Args:
+        token_data (dict): The stored token, with "access_token", "refresh_token" and
+            "token_expiry" (a datetime or an ISO 8601 string).
+        client_id (str): The Google OAuth 2.0 client ID.
+        client_secret (str): The Google OAuth 2.0 client secret.
+
+    Returns:
+        tuple: The access token to use, and the result of
+            `refresh_google_access_token` if a refresh happened (None otherwise) so
+            the caller can persist it.
+
+    Raises:
+        Exception: If the refresh process fails.
+    """
+    access_token = token_data["access_token"]
+    token_expiry = token_data["token_expiry"]
+
+    # Ensure token_expiry is an offset-aware datetime object
+    if isinstance(token_expiry, str):
+        token_expiry = datetime.fromisoformat(token_expiry)
+    if token_expiry.tzinfo is None:
+        token_expiry = token_expiry.replace(tzinfo=timezone.utc)
+
+    if token_expiry - _TOKEN_EXPIRY_LEEWAY > datetime.now(timezone.utc):
+        return access_token, None
+
+    refreshed_token = refresh_google_access_token(
+        token_data["refresh_token"], client_id, client_secret
+    )
+    return refreshed_token["access_token"], refreshed_token
+
+
 def exchange_auth_code_with_google(auth_code, client_id, client_secret, redirect_uri):
     """
     Exchanges an authorization code for access and refresh tokens using Google's library.
@@ -61,29 +117,19 @@ def exchange_auth_code_with_google(auth_code, client_id, client_secret, redirect
     :return: A dictionary containing the access_token, refresh_token, and other data.
     :raises: Exception if the token exchange fails.
     """
-    scopes = [
-        "openid",
-        "https://www.googleapis.com/auth/userinfo.email",
-        "https://www.googleapis.com/auth/classroom.courses.readonly",
-        "https://www.googleapis.com/auth/classroom.coursework.me",
-        "https://www.googleapis.com/auth/userinfo.profile",
-        "https://www.googleapis.com/auth/calendar.readonly",
-        "https://www.googleapis.com/auth/classroom.student-submissions.me.readonly",
-        "https://www.googleapis.com/auth/classroom.announcements.readonly",
-    ]
-
     # Configure the OAuth 2.0 flow
     flow = Flow.from_client_config(
         {
             "web": {
                 "client_id": client_id,
                 "client_secret": client_secret,
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
+                "auth_uri": _GOOGLE_AUTH_URI,
+                "token_uri": _GOOGLE_TOKEN_URI,
                 "redirect_uris": [redirect_uri],
             }
         },
-        scopes=scopes,
+        # The flow keeps and may mutate its scopes, so hand it a fresh list
+        scopes=list(_GOOGLE_OAUTH_SCOPES),
     )
 
     # Specify the authorization code and redirect URI
@@ -1,9 +1,67 @@
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
 from googleapiclient.errors import HttpError
 from datetime import datetime, timedelta, timezone
 import logging
 
+from app.scheduler.google.service import get_service
+
+logger = logging.getLogger(__name__)
+
+# Partial-response mask: only the event fields read by _parse_events, plus the
+# page token that list_next needs
+_EVENT_FIELDS = (
+    "items(id,summary,description,start,end,location,htmlLink,created,updated,"
+    "status,organizer/email),nextPageToken"
+)
+
+
+def _parse_events(events):
+    """
+    Converts raw Calendar API events into event detail dictionaries.
+
+    Args:
+        events (list): The 'items' of one events.list response page.
+
+    Returns:
+        list: A list of event dictionaries containing event details.
+    """
+    parsed = []
+    for event in events:
+        # Extract start and end times
+        start = event.get('start', {}).get('dateTime', event.get('start', {}).get('date'))
+        end = event.get('end', {}).get('dateTime', event.get('end', {}).get('date'))
+
+        # Parse start and end times
+        start_datetime = None
+        end_datetime = None
+
+        if start:
+            try:
+                start_datetime = datetime.fromisoformat(start)
+            except ValueError as ve:
+                logger.warning("Invalid start time format for event %s: %s", event.get('id'), ve)
+
+        if end:
+            try:
+                end_datetime = datetime.fromisoformat(end)
+            except ValueError as ve:
+                logger.warning("Invalid end time format for event %s: %s", event.get('id'), ve)
+
+        parsed.append({
+            'event_id': event.get('id'),
+            'summary': event.get('summary', 'No Title'),
+            'description': event.get('description', ''),
+            'start_time': start_datetime,
+            'end_time': end_datetime,
+            'location': event.get('location', ''),
+            'html_link': event.get('htmlLink', ''),
+            'created': event.get('created', ''),
+            'updated': event.get('updated', ''),
+            'status': event.get('status', ''),
+            'organizer': event.get('organizer', {}).get('email', ''),
+        })
+    return parsed
+
+
 def get_upcoming_events(access_token, max_results=100):
     """
     Retrieves upcoming events from the user's Google Calendar.
@@ -17,23 +75,20 @@ def get_upcoming_events(access_token, max_results=100):
     """
     events_list = []
     try:
-        # Configure logging
-        logging.basicConfig(level=logging.INFO)
-        
-        # Create credentials from the access token
-        creds = Credentials(token=access_token)
-
-        # Initialize the Calendar API
-        service = build("calendar", "v3", credentials=creds)
+        # Initialize the Calendar API, reusing a service built for this token
+        service = get_service("calendar", "v3", access_token)
 
-        # Current time in UTC
-        now = datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
+        # Current time in UTC, read once for both bounds
+        now = datetime.now(timezone.utc)
 
-        # Define the time range for events (e.g., now to next 30 days)
-        time_min = now
-        time_max = (datetime.utcnow() + timedelta(days=30)).isoformat() + 'Z'
+        # Define the time range for events (e.g., now to next 30 days) as RFC 3339
+        # timestamps; 'Z' indicates UTC time
+        time_min = now.isoformat(timespec='seconds').replace('+00:00', 'Z')
+        time_max = (now + timedelta(days=30)).isoformat(timespec='seconds').replace(
+            '+00:00', 'Z'
+        )
 
-        logging.info(f"Fetching events from {time_min} to {time_max}")
+        logger.info("Fetching events from %s to %s", time_min, time_max)
 
         # Initialize parameters for the API request
         request = service.events().list(
@@ -42,60 +97,26 @@ def get_upcoming_events(access_token, max_results=100):
             timeMax=time_max,
             maxResults=max_results,
             singleEvents=True,
-            orderBy='startTime'
+            orderBy='startTime',
+            fields=_EVENT_FIELDS,
         )
 
+        # Pages chain through pageToken; requests run on this thread, which owns
+        # the per-thread HTTP client the service was built with
         while request is not None:
             events_result = request.execute()
             events = events_result.get('items', [])
+            logger.info("Fetched %d events", len(events))
+            events_list.extend(_parse_events(events))
 
-            logging.info(f"Fetched {len(events)} events")
-
-            for event in events:
-                # Extract start and end times
-                start = event.get('start', {}).get('dateTime', event.get('start', {}).get('date'))
-                end = event.get('end', {}).get('dateTime', event.get('end', {}).get('date'))
-
-                # Parse start and end times
-                start_datetime = None
-                end_datetime = None
-
-                if start:
-                    try:
-                        start_datetime = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                    except ValueError as ve:
-                        logging.warning(f"Invalid start time format for event {event.get('id')}: {ve}")
-                
-                if end:
-                    try:
-                        end_datetime = datetime.fromisoformat(end.replace('Z', '+00:00'))
-                    except ValueError as ve:
-                        logging.warning(f"Invalid end time format for event {event.get('id')}: {ve}")
-
-                event_details = {
-                    'event_id': event.get('id'),
-                    'summary': event.get('summary', 'No Title'),
-                    'description': event.get('description', ''),
-                    'start_time': start_datetime,
-                    'end_time': end_datetime,
-                    'location': event.get('location', ''),
-                    'html_link': event.get('htmlLink', ''),
-                    'created': event.get('created', ''),
-                    'updated': event.get('updated', ''),
-                    'status': event.get('status', ''),
-                    'organizer': event.get('organizer', {}).get('email', ''),
-                }
-                events_list.append(event_details)
-
-            # Handle pagination
             request = service.events().list_next(request, events_result)
 
     except HttpError as error:
-        logging.error(f"Google API HTTP Error: {error.resp.status} - {error.content}")
+        logger.error("Google API HTTP Error: %s - %s", error.resp.status, error.content)
         raise Exception(f"An error occurred while fetching calendar events: {error}")
     except Exception as error:
-        logging.error(f"Error fetching calendar events: {error}")
+        logger.error("Error fetching calendar events: %s", error)
         raise Exception(f"An unexpected error occurred while fetching calendar events: {error}")
 
-    logging.info(f"Total events fetched: {len(events_list)}")
+    logger.info("Total events fetched: %d", len(events_list))
     return events_list
@@ -1,9 +1,116 @@
 from datetime import datetime, timedelta, timezone
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
+import random
+import time
 
+from googleapiclient.errors import HttpError
+
+from app.scheduler.google.service import get_service
 from app.utils.helper import clean_google_announcement_text
 
+# Maximum number of calls Google accepts in a single batch request
+_BATCH_LIMIT = 50
+
+# Sub-requests failing with these statuses (rate limits, transient server errors)
+# are retried with exponential backoff, up to _BATCH_MAX_RETRIES times
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+_BATCH_MAX_RETRIES = 3
+
+# Partial-response mask for course listings: only the fields read below
+_COURSE_FIELDS = "courses(id,name),nextPageToken"
+
+# Partial-response mask: only the coursework fields read below
+_COURSEWORK_FIELDS = "courseWork(id,title,description,dueDate,dueTime),nextPageToken"
+
+# Upper bound on coursework returned per page; later pages are followed in batches
+_COURSEWORK_PAGE_SIZE = 100
+
+# Partial-response mask: only the announcement fields read below
+_ANNOUNCEMENT_FIELDS = "announcements(id,text,creationTime,updateTime),nextPageToken"
+
+# Announcements are listed newest first, so a small page usually covers the window
+_ANNOUNCEMENT_PAGE_SIZE = 20
+
+
+def _execute_batched(service, requests):
+    """
+    Executes API requests through HTTP batch requests of up to `_BATCH_LIMIT` calls each.
+
+    Sub-requests rejected with a rate-limit or transient server error are retried in a
+    new batch after an exponential backoff with jitter.
+
+    Args:
+        service: The Google API service the requests were built from.
+        requests (dict): The requests to execute, keyed by a unique request ID.
+
+    Returns:
+        dict: The response of each request, keyed by the same request ID.
+
+    Raises:
+        googleapiclient.errors.HttpError: If any request fails permanently or is still
+            failing after the last retry.
+    """
+    responses = {}
+    pending = dict(requests)
+
+    for attempt in range(_BATCH_MAX_RETRIES + 1):
+        retryable = {}
+        errors = []
+
+        def collect(request_id, response, exception):
+            if exception is None:
+                responses[request_id] = response
+            elif (
+                isinstance(exception, HttpError)
+                and exception.resp.status in _RETRYABLE_STATUSES
+            ):
+                retryable[request_id] = exception
+            else:
+                errors.append(exception)
+
+        items = list(pending.items())
+        for start in range(0, len(items), _BATCH_LIMIT):
+            batch = service.new_batch_http_request(callback=collect)
+            for request_id, request in items[start : start + _BATCH_LIMIT]:
+                batch.add(request, request_id=request_id)
+            batch.execute()
+            if errors:
+                raise errors[0]
+
+        if not retryable:
+            break
+        if attempt == _BATCH_MAX_RETRIES:
+            raise next(iter(retryable.values()))
+
+        # Only resend what failed, after backing off
+        pending = {request_id: pending[request_id] for request_id in retryable}
+        time.sleep(2**attempt + random.random())
+
+    return responses
+
+
+def _list_active_courses(service):
+    """
+    Lists the user's active courses, following pagination.
+
+    Archived and provisioned courses are filtered out by the API, so no coursework or
+    announcement requests are spent on them.
+
+    Args:
+        service: The Classroom API service.
+
+    Returns:
+        list: Course dictionaries holding only 'id' and 'name'.
+    """
+    courses = []
+    request = service.courses().list(
+        courseStates=["ACTIVE"], fields=_COURSE_FIELDS, pageSize=100
+    )
+    while request is not None:
+        response = request.execute()
+        courses.extend(response.get("courses", []))
+        request = service.courses().list_next(request, response)
+    return courses
+
 
 def get_upcoming_coursework(access_token):
     """
@@ -14,65 +121,93 @@ def get_upcoming_coursework(access_token):
 
     Returns:
         list: A list of dictionaries containing reminder messages and schedule details.
+
+    Raises:
+        googleapiclient.errors.HttpError: If a Classroom API call fails.
     """
     results = []
-    try:
-        # Create credentials from the access token
-        creds = Credentials(token=access_token)
 
-        # Initialize the Classroom API
-        service = build("classroom", "v1", credentials=creds)
+    # Initialize the Classroom API, reusing a service built for this token
+    service = get_service("classroom", "v1", access_token)
+
+    # Retrieve the list of active courses
+    courses = _list_active_courses(service)
+
+    if not courses:
+        return results
+
+    coursework_api = service.courses().courseWork()
+    course_prefixes = {
+        course["id"]: f"Course: {course['name']}\n" for course in courses
+    }
+    course_results = {course_id: [] for course_id in course_prefixes}
 
-        # Retrieve the list of courses
-        courses_result = service.courses().list().execute()
-        courses = courses_result.get("courses", [])
+    # Current time, read once for every comparison below
+    now = datetime.now()
 
-        if not courses:
-            return results
+    # Retrieve the coursework of every course in batched HTTP requests
+    pending = {
+        course_id: coursework_api.list(
+            courseId=course_id,
+            pageSize=_COURSEWORK_PAGE_SIZE,
+            fields=_COURSEWORK_FIELDS,
+        )
+        for course_id in course_prefixes
+    }
 
-        # Iterate through each course to get coursework
-        for course in courses:
-            course_name = course["name"]
-            course_id = course["id"]
+    # Process each page as it arrives, then request the next pages of the
+    # courses that have more, together
+    while pending:
+        coursework_results = _execute_batched(service, pending)
+        next_pages = {}
 
-            # Retrieve the coursework for the course
-            coursework_result = (
-                service.courses().courseWork().list(courseId=course_id).execute()
-            )
+        for course_id, request in pending.items():
+            course_prefix = course_prefixes[course_id]
+            coursework_result = coursework_results.get(course_id, {})
             coursework = coursework_result.get("courseWork", [])
 
-            if coursework:
-                for work in coursework:
-                    # Check if dueDate and dueTime are available
-                    due_date = work.get("dueDate")
-                    due_time = work.get(
-                        "dueTime", {"hours": 23, "minutes": 59}
-                    )  # Default to 11:59 PM
-                    if due_date:
-                        # Convert due date and time into a datetime object
-                        due_datetime = datetime(
-                            due_date["year"],
-                            due_date["month"],
-                            due_date["day"],
-                            due_time.get("hours", 0),
-                            due_time.get("minutes", 0),
+            for work in coursework:
+                # Check if dueDate and dueTime are available
+                due_date = work.get("dueDate")
+                due_time = work.get(
+                    "dueTime", {"hours": 23, "minutes": 59}
+                )  # Default to 11:59 PM
+                if due_date:
+                    # Convert due date and time into a datetime object
+                    due_datetime = datetime(
+                        due_date["year"],
+                        due_date["month"],
+                        due_date["day"],
+                        due_time.get("hours", 0),
+                        due_time.get("minutes", 0),
+                    )
+
+                    # Compare with current time
+                    if due_datetime > now:
+                        # Same text as strftime("%Y-%m-%d %H:%M:%S"), without
+                        # interpreting a format string
+                        due_str = due_datetime.isoformat(sep=" ", timespec="seconds")
+                        reminder_message = (
+                            f"{course_prefix}"
+                            f"Coursework: {work['title']}\n"
+                            f"Description: {work.get('description', 'No description')}\n"
+                            f"Due: {due_str}\n"
                         )
+                        result = {
+                            "reminder_message": reminder_message,
+                            "due_date": due_str,
+                        }
+                        course_results[course_id].append(result)
+
+            next_page = coursework_api.list_next(request, coursework_result)
+            if next_page is not None:
+                next_pages[course_id] = next_page
+
+        pending = next_pages
 
-                        # Compare with current time
-                        if due_datetime > datetime.now():
-                            reminder_message = (
-                                f"Course: {course_name}\n"
-                                f"Coursework: {work['title']}\n"
-                                f"Description: {work.get('description', 'No description')}\n"
-                                f"Due: {due_datetime.strftime('%Y-%m-%d %H:%M:%S')}\n"
-                            )
-                            result = {
-                                "reminder_message": reminder_message,
-                                "due_date": due_datetime.strftime("%Y-%m-%d %H:%M:%S"),
-                            }
-                            results.append(result)
-    except Exception as error:
-        raise Exception(f"An error occurred: {error}")
+    # Keep the results grouped by course, in course order
+    for course_id in course_prefixes:
+        results.extend(course_results[course_id])
 
     return results
 
@@ -87,56 +222,94 @@ def get_recent_announcements(access_token, minutes=10):
 
     Returns:
         list: A list of dictionaries containing course name, announcement text, and creation time.
+
+    Raises:
+        googleapiclient.errors.HttpError: If a Classroom API call fails.
     """
     results = []
-    try:
-        # Create credentials from the access token
-        creds = Credentials(token=access_token)
 
-        # Initialize the Classroom API
-        service = build("classroom", "v1", credentials=creds)
+    # Initialize the Classroom API, reusing a service built for this token
+    service = get_service("classroom", "v1", access_token)
+
+    # Retrieve the list of active courses
+    courses = _list_active_courses(service)
+
+    if not courses:
+        return results
 
-        # Retrieve the list of courses
-        courses_result = service.courses().list().execute()
-        courses = courses_result.get("courses", [])
+    # Define the time range
+    now = datetime.now(timezone.utc)  # Google API times are in UTC
+    time_range_start = now - timedelta(minutes=minutes)
 
-        if not courses:
-            return results
+    announcements_api = service.courses().announcements()
+    course_names = {course["id"]: course["name"] for course in courses}
+    course_results = {course_id: [] for course_id in course_names}
 
-        # Define the time range
-        now = datetime.now(timezone.utc)  # Google API times are in UTC
-        time_range_start = now - timedelta(minutes=minutes)
+    # Retrieve the newest announcements of every course in batched HTTP requests
+    pending = {
+        course_id: announcements_api.list(
+            courseId=course_id,
+            orderBy="updateTime desc",
+            pageSize=_ANNOUNCEMENT_PAGE_SIZE,
+            fields=_ANNOUNCEMENT_FIELDS,
+        )
+        for course_id in course_names
+    }
 
-        # Iterate through each course to get announcements
-        for course in courses:
-            course_name = course["name"]
-            course_id = course["id"]
+    while pending:
+        announcements_results = _execute_batched(service, pending)
+        next_pages = {}
 
-            # Retrieve the announcements for the course
-            announcements_result = (
-                service.courses().announcements().list(courseId=course_id).execute()
-            )
+        for course_id, request in pending.items():
+            announcements_result = announcements_results.get(course_id, {})
             announcements = announcements_result.get("announcements", [])
 
+            reached_window_start = False
             for announcement in announcements:
+                # Announcements are ordered by update time, which is never earlier
+                # than the creation time, so nothing after this one can be in range
+                update_time_str = announcement.get(
+                    "updateTime", announcement.get("creationTime")
+                )
+                update_time = datetime.fromisoformat(update_time_str)
+                if update_time < time_range_start:
+                    reached_window_start = True
+                    break
+
                 creation_time_str = announcement.get("creationTime")
-                creation_time = datetime.fromisoformat(
-                    creation_time_str.replace("Z", "+00:00")
-                )  # Convert ISO 8601 string to datetime object
+                # Convert ISO 8601 string to datetime object; "Z" is
+                # understood natively by fromisoformat since Python 3.11
+                creation_time = datetime.fromisoformat(creation_time_str)
 
                 # Check if the announcement falls within the specified time range
                 if time_range_start <= creation_time <= now:
                     result = {
                         "announcement_id": announcement["id"],
-                        "course_name": course_name,
-                        "update_time": announcement.get("updateTime", "No update time"),
+                        "course_name": course_names[course_id],
+                        "update_time": announcement.get(
+                            "updateTime", "No update time"
+                        ),
                         "announcement_text": clean_google_announcement_text(
                             announcement.get("text", "No text provided")
                         ),
-                        "creation_time": creation_time.strftime("%Y-%m-%d %H:%M:%S"),
+                        "creation_time": creation_time.strftime(
+                            "%Y-%m-%d %H:%M:%S"
+                        ),
                     }
-                    results.append(result)
-    except Exception as error:
-        raise Exception(f"An error occurred: {error}")
+                    course_results[course_id].append(result)
+
+            # Only page further while the whole page was still inside the window
+            if not reached_window_start:
+                next_page = announcements_api.list_next(
+                    request, announcements_result
+                )
+                if next_page is not None:
+                    next_pages[course_id] = next_page
+
+        pending = next_pages
+
+    # Keep the results grouped by course, in course order
+    for course_id in course_names:
+        results.extend(course_results[course_id])
 
     return results
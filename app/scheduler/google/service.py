@@ -0,0 +1,146 @@
+import hashlib
+import json
+import threading
+from functools import lru_cache
+
+import httplib2
+import orjson
+from cachetools import TTLCache
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.model import JsonModel
+
+from config import config
+
+# Access tokens are valid for about an hour, so services are not kept longer
+_SERVICE_TTL_SECONDS = 3600
+_SERVICE_CACHE_SIZE = 32
+
+# Socket timeout for Google API calls, in seconds
+_HTTP_TIMEOUT_SECONDS = 10
+
+# httplib2.Http is not thread-safe, so every thread keeps its own connection pool
+# and its own cache of services built on top of it
+_local = threading.local()
+
+# APIs used by the scheduler, whose discovery documents can be parsed up front
+_PREWARM_APIS = (("calendar", "v3"), ("classroom", "v1"))
+
+
+class _OrjsonModel(JsonModel):
+    """JSON model that decodes API responses with orjson instead of the json module."""
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Let the stock model handle non-JSON bodies the way it always has
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+
+# Stateless, so one instance serves every service
+_json_model = _OrjsonModel()
+
+
+@lru_cache(maxsize=None)
+def _discovery_document(api, version):
+    """
+    Loads and parses the discovery document bundled for an API, once per process.
+
+    Args:
+        api (str): The API name (e.g., "calendar").
+        version (str): The API version (e.g., "v3").
+
+    Returns:
+        dict | None: The parsed discovery document, or None if none is bundled.
+    """
+    document = get_static_doc(api, version)
+    return json.loads(document) if document is not None else None
+
+
+def _thread_http():
+    """
+    Returns the calling thread's shared httplib2.Http, creating it on first use.
+
+    All services built on this thread send their requests through it, so kept-alive
+    connections to Google are reused instead of paying a TLS handshake per service.
+
+    Returns:
+        httplib2.Http: The thread's HTTP client.
+    """
+    http = getattr(_local, "http", None)
+    if http is None:
+        http = _local.http = httplib2.Http(timeout=_HTTP_TIMEOUT_SECONDS)
+    return http
+
+
+def _service_cache():
+    """
+    Returns the calling thread's service cache, creating it on first use.
+
+    Returns:
+        cachetools.TTLCache: The cache of built services for this thread.
+    """
+    cache = getattr(_local, "services", None)
+    if cache is None:
+        cache = _local.services = TTLCache(
+            maxsize=_SERVICE_CACHE_SIZE, ttl=_SERVICE_TTL_SECONDS
+        )
+    return cache
+
+
+def get_service(api, version, access_token):
+    """
+    Returns a Google API service for the access token, reusing one built earlier.
+
+    Services are cached per thread, keyed by API, version and a SHA-256 hash of the
+    token, so the raw token is never used as a cache key. New services are built from
+    the discovery document bundled with google-api-python-client, parsed once per
+    process, instead of fetching it over HTTP.
+
+    Args:
+        api (str): The API name (e.g., "calendar", "classroom").
+        version (str): The API version (e.g., "v3", "v1").
+        access_token (str): The Google API access token.
+
+    Returns:
+        googleapiclient.discovery.Resource: The service for the given API.
+    """
+    token_hash = hashlib.sha256(access_token.encode()).hexdigest()
+    key = (api, version, token_hash)
+
+    cache = _service_cache()
+    service = cache.get(key)
+    if service is None:
+        # Authorize requests for this token over the thread's pooled connections
+        http = AuthorizedHttp(Credentials(token=access_token), http=_thread_http())
+        document = _discovery_document(api, version)
+        if document is not None:
+            # Skip re-reading and re-parsing the discovery JSON on every build
+            service = build_from_document(document, http=http, model=_json_model)
+        else:
+            service = build(
+                api,
+                version,
+                http=http,
+                model=_json_model,
+                cache_discovery=False,
+                static_discovery=True,
+            )
+        cache[key] = service
+    return service
+
+
+def prewarm_discovery_documents():
+    """Parses the discovery documents of the scheduler's APIs ahead of the first request."""
+    for api, version in _PREWARM_APIS:
+        _discovery_document(api, version)
+
+
+if config.GOOGLE_PREWARM_DISCOVERY:
+    prewarm_discovery_documents()
@@ -1,11 +1,64 @@
 # app/utils/helper.py
 from datetime import datetime
-from openai import OpenAI
+from functools import lru_cache
 import re
 from typing import Optional
-import dateparser
 
-openai_client = OpenAI()
+# HTTP date format that jsonify gives datetimes, and the format shown to users
+_HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S %Z"
+_HUMAN_DATE_FORMAT = "%A, %d %B %Y at %I:%M %p"
+
+# Loose shape of an HTTP date; strings that do not fit are never handed to strptime
+_HTTP_DATE_RE = re.compile(r"^\w{3}, \d{1,2} \w{3} \d{4} \d{1,2}:\d{1,2}:\d{1,2} \w+$")
+
+# Runs of whitespace; \s also matches non-breaking spaces (\xa0) in str patterns
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# A JSON array or object inside a ```json code block
+_JSON_CODE_BLOCK_RE = re.compile(r"```json\s*(\[.*?\]|\{.*?\})\s*```", re.DOTALL)
+
+# The <speak>...</speak> block of an SSML response
+_SPEAK_BLOCK_RE = re.compile(r"(<speak>.*?</speak>)", re.DOTALL | re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _format_http_date(date_str):
+    """
+    Formats an HTTP date string (e.g., "Mon, 06 Jan 2025 14:00:00 GMT") in a
+    human-friendly way. Results are cached, as listings often repeat timestamps.
+
+    Args:
+        date_str (str): The HTTP date string.
+
+    Returns:
+        str: The formatted date, or the raw string if it cannot be parsed.
+    """
+    if not _HTTP_DATE_RE.match(date_str):
+        return date_str
+    try:
+        parsed = datetime.strptime(date_str, _HTTP_DATE_FORMAT)
+    except ValueError:
+        return date_str
+    return parsed.strftime(_HUMAN_DATE_FORMAT)
+
+
+def _format_human_datetime(value):
+    """
+    Formats a date in a human-friendly way (e.g., "Monday, 06 January 2025 at 02:00 PM").
+
+    Args:
+        value (datetime | str): A datetime object or an HTTP date string.
+
+    Returns:
+        str: The formatted date, or the value unchanged if it cannot be formatted.
+    """
+    if isinstance(value, datetime):
+        # If it's already a datetime object, format it directly
+        return value.strftime(_HUMAN_DATE_FORMAT)
+    if isinstance(value, str):
+        # Parse the string, falling back to the raw string if that fails
+        return _format_http_date(value)
+    return value
 
 
 def format_schedule_human_readable(schedule_data):
@@ -27,39 +80,32 @@ def format_schedule_human_readable(schedule_data):
     if not schedule_data["schedules"]:
         return "No schedules found."
 
-    sentences = []
-    for schedule in schedule_data["schedules"]:
-        # Extracting details
-        reminder_message = schedule.get("reminder_message", "No message")
-        schedule_date = schedule.get("schedule_date", "Unknown date")
-        status = schedule.get("status", "Unknown status")
-        recurrence = schedule.get("recurrence", "No recurrence")
-
-        # Format schedule_date to a more human-friendly format
-        if isinstance(schedule_date, datetime):
-            # If it's already a datetime object, format it directly
-            schedule_date_formatted = schedule_date.strftime("%A, %d %B %Y at %I:%M %p")
-        else:
-            try:
-                # Try parsing the string into a datetime object
-                schedule_date_parsed = datetime.strptime(
-                    schedule_date, "%a, %d %b %Y %H:%M:%S %Z"
-                )
-                schedule_date_formatted = schedule_date_parsed.strftime(
-                    "%A, %d %B %Y at %I:%M %p"
-                )
-            except (ValueError, TypeError):
-                # If parsing fails, fallback to the raw string
-                schedule_date_formatted = schedule_date
-
-        # Construct the sentence
-        sentence = (
-            f"Reminder: '{reminder_message}' is scheduled for {schedule_date_formatted} "
-            f"with a recurrence of '{recurrence}'. Status: {status}."
-        )
-        sentences.append(sentence)
+    return "\n".join(
+        _render_schedule(schedule) for schedule in schedule_data["schedules"]
+    )
 
-    return "\n".join(sentences)
+
+def _render_schedule(schedule):
+    """
+    Renders a single schedule as a human-readable sentence.
+
+    Args:
+        schedule (dict): The schedule to render.
+
+    Returns:
+        str: The sentence describing the schedule.
+    """
+    # Format schedule_date to a more human-friendly format
+    schedule_date_formatted = _format_human_datetime(
+        schedule.get("schedule_date", "Unknown date")
+    )
+
+    return (
+        f"Reminder: '{schedule.get('reminder_message', 'No message')}' is scheduled "
+        f"for {schedule_date_formatted} with a recurrence of "
+        f"'{schedule.get('recurrence', 'No recurrence')}'. "
+        f"Status: {schedule.get('status', 'Unknown status')}."
+    )
 
 
 def format_others_human_readable(other_data):
@@ -81,38 +127,29 @@ def format_others_human_readable(other_data):
     if not other_data["others"]:
         return "No announcements found."
 
-    sentences = []
-    for other in other_data["others"]:
-        # Extracting details
-        content = other.get("content", "No content available")
-        created_at = other.get("created_at", "Unknown date")
-        status = other.get("status", "Unknown status")
-
-        # Format created_at to a more human-friendly format
-        if isinstance(created_at, datetime):
-            created_at_formatted = created_at.strftime("%A, %d %B %Y at %I:%M %p")
-        else:
-            try:
-                # Try parsing the string into a datetime object
-                created_at_parsed = datetime.strptime(
-                    created_at, "%a, %d %b %Y %H:%M:%S %Z"
-                )
-                created_at_formatted = created_at_parsed.strftime(
-                    "%A, %d %B %Y at %I:%M %p"
-                )
-            except (ValueError, TypeError):
-                # If parsing fails, fallback to the raw string
-                created_at_formatted = created_at
-
-        # Construct the sentence
-        sentence = (
-            f"Content: {content}\n"
-            f"Created At: {created_at_formatted}\n"
-            f"Status: {status}."
-        )
-        sentences.append(sentence)
+    return "\n\n".join(_render_other(other) for other in other_data["others"])
 
-    return "\n\n".join(sentences)
+
+def _render_other(other):
+    """
+    Renders a single other entry as human-readable text.
+
+    Args:
+        other (dict): The other entry to render.
+
+    Returns:
+        str: The text describing the entry.
+    """
+    # Format created_at to a more human-friendly format
+    created_at_formatted = _format_human_datetime(
+        other.get("created_at", "Unknown date")
+    )
+
+    return (
+        f"Content: {other.get('content', 'No content available')}\n"
+        f"Created At: {created_at_formatted}\n"
+        f"Status: {other.get('status', 'Unknown status')}."
+    )
 
 
 def clean_google_announcement_text(text):
@@ -126,13 +163,8 @@ def clean_google_announcement_text(text):
     Returns:
         str: The cleaned-up text.
     """
-    # Replace non-breaking spaces with regular spaces
-    text = text.replace("\xa0", " ")
-
-    # Remove excessive spaces
-    text = " ".join(text.split())
-
-    return text
+    # Collapse non-breaking spaces and excessive spaces in a single pass
+    return _WHITESPACE_RE.sub(" ", text).strip()
 
 
 def extract_json_from_text(text: str) -> Optional[str]:
@@ -145,34 +177,113 @@ def extract_json_from_text(text: str) -> Optional[str]:
     Returns:
         Optional[str]: The extracted JSON string or None if not found.
     """
-    # Pattern to find a JSON array or object within code blocks:
-    code_block_pattern = re.compile(r"```json\s*(\[.*?\]|\{.*?\})\s*```", re.DOTALL)
-    match = code_block_pattern.search(text)
+    # Find a JSON array or object within code blocks
+    match = _JSON_CODE_BLOCK_RE.search(text)
     if match:
         return match.group(1)
 
-    # If not in code blocks, try to find a JSON array or object
-    json_pattern = re.compile(r"(\[.*?\]|\{.*?\})", re.DOTALL)
-    match = json_pattern.search(text)
-    if match:
-        return match.group(1)
+    # If not in code blocks, scan for the first balanced JSON array or object
+    return _find_balanced_json(text)
+
+
+def _find_balanced_json(text):
+    """
+    Finds the first balanced JSON array or object in the text in a single pass.
+    Brackets inside string literals are ignored, so nested values are kept whole.
+
+    Args:
+        text (str): The text containing JSON.
+
+    Returns:
+        Optional[str]: The JSON string, or None if no balanced array or object exists.
+    """
+    start = -1
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            # Quotes only open strings inside JSON, not in the prose around it
+            in_string = depth > 0
+        elif char in "[{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char in "]}" and depth:
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
 
-    # Not found
     return None
 
 
-def parse_datetime(dt_str: str) -> Optional[datetime]:
+def parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
     """
-    Attempt to parse a datetime from string. Return None if fails.
+    Attempt to parse a datetime from string. Return None if fails or if the string
+    is empty or None.
     """
-    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%m/%d/%Y %H:%M"):
+    if not dt_str:
+        return None
+
+    # ISO dates ("YYYY-MM-DD HH:MM:SS" or with a "T"), the format the AI is asked
+    # to use; fromisoformat is implemented in C, unlike strptime
+    try:
+        return datetime.fromisoformat(dt_str)
+    except ValueError:
+        pass
+
+    # The one other known format; the cheap check keeps other strings from strptime
+    if "/" in dt_str:
         try:
-            return datetime.strptime(dt_str, fmt)
+            return datetime.strptime(dt_str, "%m/%d/%Y %H:%M")
         except ValueError:
-            continue
-    # fallback to dateparser
-    dt = dateparser.parse(dt_str)
-    return dt
+            pass
+
+    # fallback to dateparser; relative phrases ("tomorrow 3pm") depend on the
+    # current time, so cached results are only reused within the same minute
+    return _parse_natural_datetime(
+        dt_str, datetime.now().replace(second=0, microsecond=0)
+    )
+
+
+@lru_cache(maxsize=256)
+def _parse_natural_datetime(dt_str, minute):
+    """
+    Parses a free-form date string with dateparser, caching the result per string
+    and minute.
+
+    Args:
+        dt_str (str): The date string.
+        minute (datetime): The current time, truncated to the minute. Only part of
+            the cache key, so relative phrases are resolved again once it changes.
+
+    Returns:
+        Optional[datetime]: The parsed datetime, or None if it cannot be parsed.
+    """
+    return _get_date_data_parser().get_date_data(dt_str).date_obj
+
+
+@lru_cache(maxsize=None)
+def _get_date_data_parser():
+    """
+    Builds the fallback parser for free-form dates on first use. dateparser is slow
+    to import, and most dates never reach it, so it is not loaded at startup.
+
+    Returns:
+        DateDataParser: The shared parser, pinned to English since the AI writes in
+        English, which skips dateparser's per-call language detection.
+    """
+    from dateparser import DateDataParser
+
+    return DateDataParser(languages=["en"])
 
 
 def extract_speak_block(text: str) -> str:
@@ -182,9 +293,8 @@ def extract_speak_block(text: str) -> str:
 
     If no <speak> block is found, returns an empty string.
     """
-    # Regex to capture the <speak>...some content...</speak> block
-    pattern = re.compile(r"(<speak>.*?</speak>)", re.DOTALL | re.IGNORECASE)
-    match = pattern.search(text)
+    # Capture the <speak>...some content...</speak> block
+    match = _SPEAK_BLOCK_RE.search(text)
     if match:
         return match.group(1)  # entire <speak>...</speak> block
     else:
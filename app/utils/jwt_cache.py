@@ -0,0 +1,72 @@
+# app/utils/jwt_cache.py
+import hashlib
+import inspect
+import time
+from threading import Lock
+from cachetools import TTLCache
+from flask_jwt_extended import JWTManager
+
+# How long a verified token is trusted without checking its signature again
+_DECODED_TOKEN_TTL_SECONDS = 30
+
+# The private flask_jwt_extended 4.x hook that decode_token goes through; the
+# version is pinned in requirements.txt, and startup fails if the hook changes
+_DECODE_HOOK = "_decode_jwt_from_config"
+_DECODE_HOOK_PARAMS = ["self", "encoded_token", "csrf_value", "allow_expired"]
+
+
+def _check_decode_hook():
+    """
+    Makes sure JWTManager still has the decode hook this module overrides, so a
+    flask_jwt_extended upgrade cannot silently bypass the cache.
+
+    Raises:
+        RuntimeError: If the hook is missing or its parameters have changed.
+    """
+    hook = getattr(JWTManager, _DECODE_HOOK, None)
+    if hook is None or list(inspect.signature(hook).parameters) != _DECODE_HOOK_PARAMS:
+        raise RuntimeError(
+            f"flask_jwt_extended's JWTManager.{_DECODE_HOOK} has changed; "
+            "update CachingJWTManager for this version"
+        )
+
+
+class CachingJWTManager(JWTManager):
+    """
+    JWTManager that remembers recently verified tokens.
+
+    Clients send the same access token with every request, so the decoded claims are
+    kept for a short while, keyed by a hash of the token, and the signature and claim
+    checks are skipped on repeats. Expired tokens are never served from the cache, and
+    the token type, blocklist and custom verification callbacks still run per request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        _check_decode_hook()
+        self._decoded_tokens = TTLCache(maxsize=10000, ttl=_DECODED_TOKEN_TTL_SECONDS)
+        self._decoded_tokens_lock = Lock()
+        super().__init__(*args, **kwargs)
+
+    def _decode_jwt_from_config(
+        self, encoded_token, csrf_value=None, allow_expired=False
+    ):
+        key = (
+            hashlib.sha256(encoded_token.encode()).digest()[:16],
+            csrf_value,
+            allow_expired,
+        )
+        with self._decoded_tokens_lock:
+            decoded = self._decoded_tokens.get(key)
+
+        # Past its expiry, the full decode decides (and applies any leeway)
+        if decoded is None or (
+            not allow_expired and decoded.get("exp", float("inf")) <= time.time()
+        ):
+            decoded = super()._decode_jwt_from_config(
+                encoded_token, csrf_value, allow_expired
+            )
+            with self._decoded_tokens_lock:
+                self._decoded_tokens[key] = decoded
+
+        # Hand out a copy so callers cannot change the cached claims
+        return dict(decoded)
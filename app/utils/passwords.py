@@ -0,0 +1,108 @@
+# app/utils/passwords.py
+import time
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
+from argon2.low_level import hash_secret_raw
+from werkzeug.security import check_password_hash
+from config import config
+
+# Argon2id with the OWASP minimum profile: 19 MiB of memory, 2 passes, 1 lane
+_MEMORY_COST = 19456
+_MIN_TIME_COST = 2
+_MAX_TIME_COST = 10
+_PARALLELISM = 1
+
+# Timed hashes per candidate time cost during calibration
+_CALIBRATION_RUNS = 5
+
+
+def calibrate_time_cost(target_ms):
+    """
+    Finds the smallest Argon2 time cost whose hashes take at least `target_ms` on
+    this machine. Memory cost and parallelism stay at the OWASP profile, so the
+    result is never weaker than the defaults.
+
+    Args:
+        target_ms (int): The target duration of one hash, in milliseconds.
+
+    Returns:
+        int: The time cost, between the default and an upper bound that keeps
+        logins from stalling on slow machines.
+    """
+    target_ns = target_ms * 1_000_000
+    for time_cost in range(_MIN_TIME_COST, _MAX_TIME_COST + 1):
+        start = time.perf_counter_ns()
+        for _ in range(_CALIBRATION_RUNS):
+            hash_secret_raw(
+                b"calibration-password",
+                b"calibration-salt",
+                time_cost=time_cost,
+                memory_cost=_MEMORY_COST,
+                parallelism=_PARALLELISM,
+                hash_len=32,
+                type=Type.ID,
+            )
+        if (time.perf_counter_ns() - start) / _CALIBRATION_RUNS >= target_ns:
+            return time_cost
+    return _MAX_TIME_COST
+
+
+# The time cost is fixed in config (never below the OWASP minimum), so every worker
+# hashes alike; calibrate_time_cost is run offline via `flask calibrate-argon2`
+password_hasher = PasswordHasher(
+    time_cost=max(config.ARGON2_TIME_COST, _MIN_TIME_COST),
+    memory_cost=_MEMORY_COST,
+    parallelism=_PARALLELISM,
+)
+
+
+def hash_password(password):
+    """
+    Hashes a password with Argon2id.
+
+    Args:
+        password (str): The plain-text password.
+
+    Returns:
+        str: The encoded hash, including its parameters and salt.
+    """
+    return password_hasher.hash(password)
+
+
+def verify_password(password_hash, password):
+    """
+    Checks a password against a stored hash.
+
+    Hashes created by werkzeug before the switch to Argon2 (e.g., "pbkdf2:sha256:...")
+    are still accepted, so existing users can keep logging in.
+
+    Args:
+        password_hash (str): The stored password hash.
+        password (str): The plain-text password to check.
+
+    Returns:
+        bool: True if the password matches, False otherwise.
+    """
+    if not password_hash.startswith("$argon2"):
+        return check_password_hash(password_hash, password)
+
+    try:
+        return password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(password_hash):
+    """
+    Checks whether a stored hash should be replaced after a successful login.
+
+    Args:
+        password_hash (str): The stored password hash.
+
+    Returns:
+        bool: True for legacy werkzeug hashes and for Argon2 hashes made with other
+        parameters than the current ones, False otherwise.
+    """
+    if not password_hash.startswith("$argon2"):
+        return True
+    return password_hasher.check_needs_rehash(password_hash)
@@ -1,8 +1,21 @@
-from flask import request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import current_app, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token
-from app.models.user_model import create_user, find_user_by_id, user_collection
+from pymongo.errors import DuplicateKeyError
+from app.models.user_model import (
+    create_user,
+    find_user_by_id,
+    update_user_password,
+    user_collection,
+)
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.passwords import (
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
+
+# Fields a signup request must provide, all non-empty
+_SIGNUP_FIELDS = ("username", "email", "password", "phone_number", "nationality", "age")
 
 
 def signup():
@@ -15,25 +28,13 @@ def signup():
         JSON response with an error message and appropriate HTTP status code on failure.
     """
     try:
-        # Extract JSON data from the request
-        data = request.get_json()
-        username = data.get("username")
-        email = data.get("email")
-        phone_number = data.get("phone_number")
-        nationality = data.get("nationality")
-        age = data.get("age")
-        password = data.get("password")
+        # Extract JSON data from the request; a missing or malformed body is
+        # reported as missing fields below
+        data = request.get_json(silent=True) or {}
+        values = {field: data.get(field) for field in _SIGNUP_FIELDS}
 
         # Validate required fields
-        required_fields = [
-            "username",
-            "email",
-            "password",
-            "phone_number",
-            "nationality",
-            "age",
-        ]
-        missing_fields = [field for field in required_fields if not data.get(field)]
+        missing_fields = [field for field, value in values.items() if not value]
         if missing_fields:
             return (
                 jsonify(
@@ -42,27 +43,18 @@ def signup():
                 400,
             )
 
-        # Check if the username or email already exists
-        if user_collection.find_one(
-            {"$or": [{"username": username}, {"email": email}]}
-        ):
-            return jsonify({"error": "Username or email already exists."}), 409
-
         # Hash the password before storing it
-        hashed_password = generate_password_hash(password)
+        hashed_password = hash_password(values["password"])
 
         # Prepare user data for creation
-        user_data = {
-            "username": username,
-            "email": email,
-            "phone_number": phone_number,
-            "nationality": nationality,
-            "age": age,
-            "password": hashed_password,  # Store hashed password
-        }
-
-        # Create the user in the database
-        user_id = create_user(user_data)
+        user_data = {**values, "password": hashed_password}  # Store hashed password
+
+        # Create the user in the database; the unique indexes on username and
+        # email reject duplicates atomically, so there is no separate check
+        try:
+            user_id = create_user(user_data)
+        except DuplicateKeyError:
+            return jsonify({"error": "Username or email already exists."}), 409
 
         return (
             jsonify({"message": "User signed up successfully.", "user_id": user_id}),
@@ -79,8 +71,8 @@ def login():
     Handles user login by validating credentials and returning a JWT token.
     """
     try:
-        # Extract JSON data
-        data = request.get_json()
+        # Extract JSON data; a missing or malformed body fails the input check below
+        data = request.get_json(silent=True) or {}
         email = data.get("email")
         password = data.get("password")
 
@@ -89,14 +81,26 @@ def login():
             return jsonify({"error": "Email and password are required."}), 400
 
         # Find user in the database
-        user = user_collection.find_one({"email": email})
+        # Only the ID and password hash are needed to log in
+        user = user_collection.find_one({"email": email}, {"password": 1})
         if not user:
             return jsonify({"error": "Invalid email or password."}), 401
 
         # Verify password
-        if not check_password_hash(user["password"], password):
+        if not verify_password(user["password"], password):
             return jsonify({"error": "Invalid email or password."}), 401
 
+        # Upgrade legacy or outdated hashes while the plain password is at hand;
+        # best-effort, as the password is already verified and the old hash still
+        # works, so a failure here must not fail the login
+        if password_needs_rehash(user["password"]):
+            try:
+                update_user_password(user["_id"], hash_password(password))
+            except Exception as e:
+                current_app.logger.warning(
+                    f"Failed to rehash password for user {user['_id']}: {e}"
+                )
+
         # Generate JWT token
         access_token = create_access_token(identity=str(user["_id"]))
         refresh_token = create_refresh_token(identity=str(user["_id"]))
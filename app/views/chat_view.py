@@ -3,7 +3,7 @@ from bson import ObjectId
 from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
-from app.models.user_model import find_user_by_id
+from app.models.user_model import find_user_profile
 from app.models.chat_model import (
     find_chat_by_id,
     create_chat,
@@ -35,7 +35,6 @@ from app.ai.caller import (
 )
 from bson.errors import InvalidId
 
-
 def create_new_chat_with_system_prompt(
     user_id, user, conversation_type="chat", language="English"
 ):
@@ -141,7 +140,7 @@ def get_or_create_chat(user_id, data, conversation_type="chat", language="Englis
     Returns: chat_doc, conversation_history, chat_title, chat_id
     """
     chat_id = data.get("chat_id")
-    user = find_user_by_id(user_id)
+    user = find_user_profile(user_id)
     if not user:
         return None, None, None, None, None
 
@@ -167,15 +166,21 @@ def append_user_message(chat_id, conversation_history, user_prompt):
     conversation_history.append(user_msg)
 
 
-def maybe_proactive_trimming(chat_id, conversation_history):
+def maybe_proactive_trimming(chat_id, conversation_history, chat_doc):
     """
     If conversation is large, summarize older messages and store in DB.
+    chat_doc is the chat as loaded for this request ({} for a new chat); its
+    summary_so_far is extended rather than fetching the chat again.
     """
     MAX_RECENT = 8
-    system_msgs = [m for m in conversation_history if m["role"] == "system"]
-    user_assistant_msgs = [
-        m for m in conversation_history if m["role"] in ["user", "assistant"]
-    ]
+    # Split the history by role in a single pass
+    system_msgs, user_assistant_msgs = [], []
+    for m in conversation_history:
+        role = m["role"]
+        if role == "system":
+            system_msgs.append(m)
+        elif role in ("user", "assistant"):
+            user_assistant_msgs.append(m)
 
     if len(user_assistant_msgs) > MAX_RECENT:
         older_count = len(user_assistant_msgs) - MAX_RECENT
@@ -183,8 +188,7 @@ def maybe_proactive_trimming(chat_id, conversation_history):
         recent_chunk = user_assistant_msgs[older_count:]
 
         summary_text = summarize_with_ai(older_chunk)
-        existing_chat = find_chat_by_id(chat_id)
-        existing_summary = existing_chat.get("summary_so_far") or ""
+        existing_summary = chat_doc.get("summary_so_far") or ""
 
         combined_summary = (
             existing_summary + "\n\n" + summary_text
@@ -498,7 +502,7 @@ def chat():
             return jsonify({"chat_id": chat_id, "response": combined_response}), 200
 
         # 5) Normal LLM flow if no schedule actions recognized
-        maybe_proactive_trimming(chat_id, conversation_history)
+        maybe_proactive_trimming(chat_id, conversation_history, chat_doc)
         ai_response = get_ai_response(prompt, conversation_history)
 
         if conversation_type == "call":
@@ -3,15 +3,19 @@ from flask import jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.other_model import (
     create_other,
+    create_others_bulk,
     find_others_by_user_id,
     delete_other as delete_other_model,
 )
-from app.models.token_model import find_token_by_user_and_service, update_token
-from app.scheduler.google.authentication import refresh_google_access_token
+from app.models.token_model import (
+    TOKEN_CREDENTIAL_FIELDS,
+    find_token_by_user_and_service,
+    update_token,
+)
+from app.scheduler.google.authentication import get_valid_access_token
 from app.scheduler.google.classroom import get_recent_announcements
 from app.models.other_model import set_seen_to_true, find_others_by_user_id
 from app.ai.caller import summarize_with_ai
-from datetime import datetime, timezone
 from config import config
 from bson.errors import InvalidId
 
@@ -77,39 +81,24 @@ def sync_google_announcements_to_others():
 
         # Retrieve the token for Google Classroom
         try:
-            token_data = find_token_by_user_and_service(user_id, "google_classroom")
+            token_data = find_token_by_user_and_service(
+                user_id, "google_classroom", fields=TOKEN_CREDENTIAL_FIELDS
+            )
             if not token_data:
                 return jsonify({"error": "No token found for Google Classroom"}), 404
         except Exception as e:
             return jsonify({"error": f"Failed to retrieve token: {str(e)}"}), 500
 
-        # Check if the token is expired
-        access_token = token_data.get("access_token")
-        refresh_token = token_data.get("refresh_token")
-        token_expiry = token_data.get("token_expiry")
-
-        if not access_token or not refresh_token or not token_expiry:
+        # Check the token is complete
+        if not all(token_data.get(field) for field in TOKEN_CREDENTIAL_FIELDS):
             return jsonify({"error": "Token data is incomplete"}), 500
 
-        # Ensure token_expiry is a datetime object
-        if isinstance(token_expiry, str):
-            token_expiry = datetime.fromisoformat(token_expiry)
-
-        # Make token_expiry offset-aware if it's naive
-        if token_expiry.tzinfo is None:
-            token_expiry = token_expiry.replace(tzinfo=timezone.utc)
-
-        # Refresh the token if expired
-        if token_expiry <= datetime.now(timezone.utc):
-            try:
-                refreshed_token = refresh_google_access_token(
-                    refresh_token,
-                    config.GOOGLE_CLIENT_ID,
-                    config.GOOGLE_CLIENT_SECRET,
-                )
-                access_token = refreshed_token["access_token"]
-
-                # Update the token in the database
+        # Refresh the token if expired (or about to), saving the new one
+        try:
+            access_token, refreshed_token = get_valid_access_token(
+                token_data, config.GOOGLE_CLIENT_ID, config.GOOGLE_CLIENT_SECRET
+            )
+            if refreshed_token:
                 update_token(
                     user_id,
                     "google_classroom",
@@ -118,8 +107,8 @@ def sync_google_announcements_to_others():
                         "token_expiry": refreshed_token["expiry"].isoformat(),
                     },
                 )
-            except Exception as e:
-                return jsonify({"error": f"Failed to refresh token: {str(e)}"}), 500
+        except Exception as e:
+            return jsonify({"error": f"Failed to refresh token: {str(e)}"}), 500
 
         # Fetch recent announcements using the valid access token
         try:
@@ -131,8 +120,8 @@ def sync_google_announcements_to_others():
         existing_others = find_others_by_user_id(user_id)
         existing_content = {other["content"] for other in existing_others}
 
-        # Add new announcements to others
-        new_other_ids = []
+        # Collect new announcements so they can be inserted in one round trip
+        new_others = []
         for announcement in announcements:
             announcement_text = (
                 f"Course: {announcement['course_name']}\n"
@@ -141,21 +130,13 @@ def sync_google_announcements_to_others():
             )
 
             if announcement_text not in existing_content:
-                # Prepare other data
-                other_data = {
-                    "user_id": user_id,
-                    "content": announcement_text,
-                }
+                new_others.append({"user_id": user_id, "content": announcement_text})
 
-                # Add the other to the database
-                try:
-                    other_id = create_other(other_data)
-                    new_other_ids.append(other_id)
-                except Exception as e:
-                    return (
-                        jsonify({"error": f"Failed to create other: {str(e)}"}),
-                        500,
-                    )
+        # Add the others to the database
+        try:
+            new_other_ids = create_others_bulk(new_others)
+        except Exception as e:
+            return jsonify({"error": f"Failed to create others: {str(e)}"}), 500
 
         # Return appropriate response based on whether new others were added
         if not new_other_ids:
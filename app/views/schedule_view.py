@@ -3,6 +3,7 @@ from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.schedule_model import (
     create_schedule,
+    create_schedules_bulk,
     delete_all_schedules_for_user,
     find_schedules_by_user_id,
     find_schedule_by_id,
@@ -13,8 +14,12 @@ from app.models.schedule_model import (
 from datetime import datetime, timezone, timedelta
 from bson.errors import InvalidId
 
-from app.models.token_model import find_token_by_user_and_service, update_token
-from app.scheduler.google.authentication import refresh_google_access_token
+from app.models.token_model import (
+    TOKEN_CREDENTIAL_FIELDS,
+    find_token_by_user_and_service,
+    update_token,
+)
+from app.scheduler.google.authentication import get_valid_access_token
 from app.scheduler.google.calendar import get_upcoming_events
 from app.scheduler.google.classroom import get_upcoming_coursework
 
@@ -264,11 +269,6 @@ def get_schedule(id):
         return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
 
 
-from flask import jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.schedule_model import find_schedules_by_user_id
-
-
 @jwt_required()
 def get_all_schedules():
     """
@@ -487,49 +487,34 @@ def sync_google_coursework_to_schedules():
 
         # Retrieve the token for Google Classroom
         try:
-            token_data = find_token_by_user_and_service(user_id, "google_classroom")
+            token_data = find_token_by_user_and_service(
+                user_id, "google_classroom", fields=TOKEN_CREDENTIAL_FIELDS
+            )
             if not token_data:
                 return jsonify({"error": "No token found for Google Classroom"}), 404
         except Exception as e:
             return jsonify({"error": f"Failed to retrieve token: {str(e)}"}), 500
 
-        # Check if the token is expired
-        access_token = token_data.get("access_token")
-        refresh_token = token_data.get("refresh_token")
-        token_expiry = token_data.get("token_expiry")
-
-        if not access_token or not refresh_token or not token_expiry:
+        # Check the token is complete
+        if not all(token_data.get(field) for field in TOKEN_CREDENTIAL_FIELDS):
             return jsonify({"error": "Token data is incomplete"}), 500
 
-        # Ensure token_expiry is a datetime object
-        if isinstance(token_expiry, str):
-            token_expiry = datetime.fromisoformat(token_expiry)
-
-        # Make token_expiry offset-aware if it's naive
-        if token_expiry.tzinfo is None:
-            token_expiry = token_expiry.replace(tzinfo=timezone.utc)
-
-        # Refresh the token if expired
-        if token_expiry <= datetime.now(timezone.utc):
-            try:
-                refreshed_token = refresh_google_access_token(
-                    refresh_token,
-                    config.GOOGLE_CLIENT_ID,
-                    config.GOOGLE_CLIENT_SECRET,
-                )
-                access_token = refreshed_token["access_token"]
-
-                # Update the token in the database
+        # Refresh the token if expired (or about to), saving the new one
+        try:
+            access_token, refreshed_token = get_valid_access_token(
+                token_data, config.GOOGLE_CLIENT_ID, config.GOOGLE_CLIENT_SECRET
+            )
+            if refreshed_token:
                 update_token(
                     user_id,
-                    "google",
+                    "google_classroom",
                     {
                         "access_token": refreshed_token["access_token"],
                         "token_expiry": refreshed_token["expiry"].isoformat(),
                     },
                 )
-            except Exception as e:
-                return jsonify({"error": f"Failed to refresh token: {str(e)}"}), 500
+        except Exception as e:
+            return jsonify({"error": f"Failed to refresh token: {str(e)}"}), 500
 
         # Fetch upcoming coursework using the valid access token
         try:
@@ -538,36 +523,37 @@ def sync_google_coursework_to_schedules():
             return jsonify({"error": f"Failed to fetch coursework: {str(e)}"}), 500
 
         # Get existing schedules for the user
-        existing_schedules = find_schedules_by_user_id(user_id)
+        existing_schedules = find_schedules_by_user_id(
+            user_id, fields=["reminder_message"]
+        )
         existing_reminders = {
             schedule["reminder_message"] for schedule in existing_schedules
         }
 
-        # Add new coursework to schedules
-        new_schedule_ids = []
+        # Collect new coursework so it can be inserted in one round trip
+        new_schedules = []
         for work in coursework:
             reminder_message = work["reminder_message"]
             schedule_date = datetime.fromisoformat(work["due_date"])
 
             if reminder_message not in existing_reminders:
-                # Prepare schedule data
-                schedule_data = {
-                    "user_id": user_id,
-                    "reminder_message": reminder_message,
-                    "schedule_date": schedule_date,
-                    "recurrence": None,  # Coursework doesn't recur by default
-                    "status": "Pending",
-                }
+                new_schedules.append(
+                    {
+                        "user_id": user_id,
+                        "reminder_message": reminder_message,
+                        "schedule_date": schedule_date,
+                        # Coursework is due at a single point in time
+                        "schedule_end_date": schedule_date,
+                        "recurrence": None,  # Coursework doesn't recur by default
+                        "status": "Pending",
+                    }
+                )
 
-                # Add the schedule to the database
-                try:
-                    schedule_id = create_schedule(schedule_data)
-                    new_schedule_ids.append(schedule_id)
-                except Exception as e:
-                    return (
-                        jsonify({"error": f"Failed to create schedule: {str(e)}"}),
-                        500,
-                    )
+        # Add the schedules to the database
+        try:
+            new_schedule_ids = create_schedules_bulk(new_schedules)
+        except Exception as e:
+            return jsonify({"error": f"Failed to create schedules: {str(e)}"}), 500
 
         # Return appropriate response based on whether new schedules were added
         if not new_schedule_ids:
@@ -605,36 +591,21 @@ def sync_google_calendar_to_schedules():
             return jsonify({"error": "Unauthorized access"}), 401
 
         # Retrieve the token for Google Calendar
-        token_data = find_token_by_user_and_service(user_id, "google_calendar")
+        token_data = find_token_by_user_and_service(
+            user_id, "google_calendar", fields=TOKEN_CREDENTIAL_FIELDS
+        )
         if not token_data:
             return jsonify({"error": "No token found for Google Calendar"}), 404
 
-        # Check if the token is expired and refresh if necessary
-        access_token = token_data.get("access_token")
-        refresh_token = token_data.get("refresh_token")
-        token_expiry = token_data.get("token_expiry")
-
-        if not access_token or not refresh_token or not token_expiry:
+        # Check the token is complete
+        if not all(token_data.get(field) for field in TOKEN_CREDENTIAL_FIELDS):
             return jsonify({"error": "Token data is incomplete"}), 500
 
-        # Ensure token_expiry is a datetime object
-        if isinstance(token_expiry, str):
-            token_expiry = datetime.fromisoformat(token_expiry)
-
-        # Make token_expiry offset-aware if it's naive
-        if token_expiry.tzinfo is None:
-            token_expiry = token_expiry.replace(tzinfo=timezone.utc)
-
-        # Refresh the token if expired
-        if token_expiry <= datetime.now(timezone.utc):
-            refreshed_token = refresh_google_access_token(
-                refresh_token,
-                config.GOOGLE_CLIENT_ID,
-                config.GOOGLE_CLIENT_SECRET,
-            )
-            access_token = refreshed_token["access_token"]
-
-            # Update the token in the database
+        # Refresh the token if expired (or about to), saving the new one
+        access_token, refreshed_token = get_valid_access_token(
+            token_data, config.GOOGLE_CLIENT_ID, config.GOOGLE_CLIENT_SECRET
+        )
+        if refreshed_token:
             update_token(
                 user_id,
                 "google_calendar",
@@ -648,37 +619,36 @@ def sync_google_calendar_to_schedules():
         events = get_upcoming_events(access_token)
 
         # Get existing schedules for the user
-        existing_schedules = find_schedules_by_user_id(user_id)
+        existing_schedules = find_schedules_by_user_id(user_id, fields=["event_id"])
         existing_event_ids = {
             schedule.get("event_id")
             for schedule in existing_schedules
             if schedule.get("event_id")
         }
 
-        # Add new events to schedules
-        new_schedule_ids = []
+        # Collect new events so they can be inserted in one round trip
+        new_schedules = []
         for event in events:
             event_id = event["event_id"]
             if event_id not in existing_event_ids:
-                # Prepare schedule data
-                schedule_data = {
-                    "user_id": user_id,
-                    "reminder_message": event["summary"],
-                    "schedule_date": event["start_time"],
-                    "recurrence": None,  # Handle recurrence if necessary
-                    "status": "Pending",
-                    "event_id": event_id,  # Store the event ID to prevent duplicates
-                }
+                new_schedules.append(
+                    {
+                        "user_id": user_id,
+                        "reminder_message": event["summary"],
+                        "schedule_date": event["start_time"],
+                        # Fall back to the start time for events without an end
+                        "schedule_end_date": event["end_time"] or event["start_time"],
+                        "recurrence": None,  # Handle recurrence if necessary
+                        "status": "Pending",
+                        "event_id": event_id,  # Store the event ID to prevent duplicates
+                    }
+                )
 
-                # Add the schedule to the database
-                try:
-                    schedule_id = create_schedule(schedule_data)
-                    new_schedule_ids.append(schedule_id)
-                except Exception as e:
-                    return (
-                        jsonify({"error": f"Failed to create schedule: {str(e)}"}),
-                        500,
-                    )
+        # Add the schedules to the database
+        try:
+            new_schedule_ids = create_schedules_bulk(new_schedules)
+        except Exception as e:
+            return jsonify({"error": f"Failed to create schedules: {str(e)}"}), 500
 
         # Return appropriate response based on whether new schedules were added
         if not new_schedule_ids:
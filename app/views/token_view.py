@@ -9,6 +9,7 @@ from app.scheduler.google.authentication import (
 from config import config
 
 from app.models.token_model import (
+    TOKEN_CREDENTIAL_FIELDS,
     create_token,
     find_token_by_user_and_service,
     find_tokens_by_user,
@@ -69,7 +70,9 @@ def add_token():
                 )
 
         # Check if a token already exists for this user and service
-        existing_token = find_token_by_user_and_service(user_id, data["service_name"])
+        existing_token = find_token_by_user_and_service(
+            user_id, data["service_name"], fields=["_id"]
+        )
 
         token_data = {
             "user_id": user_id,  # Use the authenticated user's ID
@@ -129,7 +132,9 @@ def get_token(service_name):
             return jsonify({"error": "Unauthorized access"}), 401
 
         # Find the token for the user and service
-        token = find_token_by_user_and_service(user_id, service_name)
+        token = find_token_by_user_and_service(
+            user_id, service_name, fields=TOKEN_CREDENTIAL_FIELDS
+        )
         if not token:
             return jsonify({"error": "Token not found"}), 404
 
@@ -164,10 +169,11 @@ def get_all_tokens():
         if not user_id:
             return jsonify({"error": "Unauthorized access"}), 401
 
-        # Find all tokens for the user
-        tokens = find_tokens_by_user(user_id)
-        if not tokens:
-            return jsonify([])
+        # Find all tokens for the user; the cursor is consumed as the response is built
+        tokens = find_tokens_by_user(
+            user_id,
+            fields=["service_name", "access_token", "refresh_token", "token_expiry"],
+        )
 
         # Prepare the response
         token_data = [
@@ -287,7 +293,9 @@ def add_google_access_and_refresh_token(service_name):
         }
 
         # Check if token already exists
-        existing_token = find_token_by_user_and_service(user_id, service_name)
+        existing_token = find_token_by_user_and_service(
+            user_id, service_name, fields=["_id"]
+        )
         if existing_token:
             # Prepare updates by excluding 'user_id' and 'service_name'
             updates = {
@@ -345,7 +353,9 @@ def refresh_google_access_token_view(service_name):
             return jsonify({"error": "Unauthorized access"}), 401
 
         # Retrieve existing token
-        token = find_token_by_user_and_service(user_id, service_name)
+        token = find_token_by_user_and_service(
+            user_id, service_name, fields=["refresh_token"]
+        )
         if not token:
             return jsonify({"error": f"{service_name} token not found"}), 404
 
@@ -24,6 +24,16 @@ class Config:
     MONGO_PASSWORD = os.getenv("MONGO_PASSWORD")
     MONGO_ATLAS = os.getenv("MONGO_ATLAS", "False") == "True"
     SENTRY_DSN = os.getenv("SENTRY_DSN")
+    # Create missing indexes when collections are first requested. Leave off for
+    # app workers and run `flask ensure-indexes` once per deploy instead.
+    ENSURE_INDEXES = os.getenv("ENSURE_INDEXES", "False") == "True"
+    # Parse the Google API discovery documents at import time to speed up cold starts
+    GOOGLE_PREWARM_DISCOVERY = os.getenv("GOOGLE_PREWARM_DISCOVERY", "False") == "True"
+    # Argon2 time cost for password hashes. Must be the same on every worker, or
+    # logins keep rehashing; pick it with `flask calibrate-argon2` on the server
+    ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 2))
+    # Target duration of one password hash for `flask calibrate-argon2`
+    ARGON2_TARGET_MS = int(os.getenv("ARGON2_TARGET_MS", 250))
 
     @staticmethod
     def init_app(app):
@@ -1,5 +1,7 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, IndexModel
 from pymongo.errors import ConnectionFailure
+from bson.objectid import ObjectId
+from functools import lru_cache
 import os
 from config import config
 
@@ -43,21 +45,168 @@ except ConnectionFailure as e:
 # Select the database
 db = client[getattr(config, "MONGO_DB", "default_db")]
 
-# Define a helper function to get collections with indexes
-def get_collection(name, indexes=None):
+# Collection handles shared by every model, keyed by collection name
+_collections = {}
+
+# Index specifications declared by the models, keyed by collection name
+_declared_indexes = {}
+
+# Names of superseded indexes to drop, keyed by collection name
+_obsolete_indexes = {}
+
+# Collections whose declared indexes have already been ensured in this process
+_indexes_ensured = set()
+
+
+def _collection_handle(name):
     """
-    Get a MongoDB collection with optional index setup.
+    Return the shared handle for a collection, creating it on first use.
 
     Args:
         name (str): The name of the collection.
-        indexes (list, optional): A list of index specifications. Each index is a tuple
-                                   with the field name and direction (e.g., [("field", 1)]).
 
     Returns:
         pymongo.collection.Collection: The MongoDB collection.
     """
-    collection = db[name]
-    if indexes:
-        for index in indexes:
-            collection.create_index(index, background=True)
+    collection = _collections.get(name)
+    if collection is None:
+        collection = _collections[name] = db[name]
     return collection
+
+
+def _ensure_collection_indexes(name):
+    """
+    Create any declared indexes missing from a collection and drop obsolete ones,
+    at most once per process.
+
+    Args:
+        name (str): The name of the collection.
+    """
+    if name in _indexes_ensured:
+        return
+    collection = _collection_handle(name)
+    # Only issue createIndexes for indexes that do not exist yet
+    existing = collection.index_information()
+    for index in _declared_indexes.get(name, ()):
+        # Indexes with options (e.g. unique) are declared as IndexModel instances
+        if not isinstance(index, IndexModel):
+            index = IndexModel(index, background=True)
+        if index.document["name"] not in existing:
+            collection.create_indexes([index])
+    # Drop superseded indexes so writes stop maintaining them
+    for index_name in _obsolete_indexes.get(name, ()):
+        if index_name in existing:
+            collection.drop_index(index_name)
+    _indexes_ensured.add(name)
+
+
+def ensure_indexes():
+    """
+    Create missing and drop obsolete indexes of every collection declared through
+    `get_collection`.
+
+    Meant to be run out-of-band (e.g. `flask ensure-indexes` during a deploy) rather
+    than from every worker process at import time.
+
+    Returns:
+        list: The names of the collections that were checked.
+    """
+    names = list(dict.fromkeys([*_declared_indexes, *_obsolete_indexes]))
+    for name in names:
+        _ensure_collection_indexes(name)
+    return names
+
+
+# Define a helper function to get collections with indexes
+def get_collection(name, indexes=None, obsolete_indexes=None):
+    """
+    Get a MongoDB collection and declare the indexes it should have.
+
+    Declared indexes are only created when `ensure_indexes()` runs, or immediately if
+    `ENSURE_INDEXES` is enabled in the config, so importing a model stays cheap.
+
+    Args:
+        name (str): The name of the collection.
+        indexes (list, optional): A list of index specifications. Each index is a list
+                                   of (field name, direction) tuples (e.g., [("field", 1)]),
+                                   or a pymongo IndexModel for indexes with options such as
+                                   `unique=True`.
+        obsolete_indexes (list, optional): Names of indexes that have been superseded
+                                   (e.g., "user_id_1") and should be dropped.
+
+    Returns:
+        pymongo.collection.Collection: The MongoDB collection.
+    """
+    if indexes or obsolete_indexes:
+        declared = _declared_indexes.setdefault(name, [])
+        declared.extend(index for index in indexes or () if index not in declared)
+        obsolete = _obsolete_indexes.setdefault(name, [])
+        obsolete.extend(
+            index_name for index_name in obsolete_indexes or () if index_name not in obsolete
+        )
+        if getattr(config, "ENSURE_INDEXES", False):
+            _indexes_ensured.discard(name)
+            _ensure_collection_indexes(name)
+    return _collection_handle(name)
+
+
+def fields_projection(fields):
+    """
+    Build a find() projection that returns only the given fields.
+
+    `_id` is excluded unless explicitly requested, so a projection made of indexed
+    fields lets MongoDB answer the query from the index alone (a covered query).
+
+    Args:
+        fields (list, optional): Names of the fields to return.
+
+    Returns:
+        dict | None: The projection, or None to return whole documents.
+    """
+    if not fields:
+        return None
+    projection = {field: 1 for field in fields}
+    projection.setdefault("_id", 0)
+    return projection
+
+
+def to_object_id(value):
+    """
+    Convert an ID string to an ObjectId, reusing recently parsed values.
+
+    The same handful of user IDs is converted over and over on hot paths, so parsed
+    ObjectIds are kept in a small LRU cache. Invalid values raise and are not cached.
+
+    Args:
+        value (str | ObjectId): The ID to convert.
+
+    Returns:
+        bson.objectid.ObjectId: The parsed ObjectId.
+
+    Raises:
+        bson.errors.InvalidId: If `value` is not a valid ObjectId string.
+        TypeError: If `value` is neither a string nor an ObjectId (including None,
+                   for which ObjectId() would silently generate a new ID).
+    """
+    if isinstance(value, ObjectId):
+        return value
+    if not isinstance(value, str):
+        raise TypeError(f"Expected an ObjectId or str, got {type(value).__name__}")
+    return _parse_object_id(value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_object_id(value):
+    """
+    Parse an ID string into an ObjectId; the cache behind `to_object_id`.
+
+    Args:
+        value (str): The ID string.
+
+    Returns:
+        bson.objectid.ObjectId: The parsed ObjectId.
+
+    Raises:
+        bson.errors.InvalidId: If `value` is not a valid ObjectId string.
+    """
+    return ObjectId(value)